@@ -0,0 +1,264 @@
+"""Lightweight in-process metrics with Prometheus text exposition.
+
+Everything here is cheap enough to leave on in production: recording a sample
+is a dict lookup and a few additions under a lock. Each worker process keeps
+its own registry, so scrape every worker (or aggregate by instance label).
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+# Mongo commands issued while serving the current request; Motor copies the
+# context into its executor threads, so the command listener sees the same list.
+request_db_commands: ContextVar[Optional[List[int]]] = ContextVar("request_db_commands", default=None)
+
+
+def format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def set(self, *labels: str, value: float):
+        """Overwrite the value, for mirroring counts maintained elsewhere"""
+        with self.lock:
+            self.values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            items = list(self.values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [bucket counts..., sum, count]
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = [(labels, list(state)) for labels, state in self.values.items()]
+        for labels, state in items:
+            for index, bound in enumerate(self.buckets):
+                bucket = format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{bucket} {state[index]}")
+            inf_bucket = format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_bucket} {state[-1]}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {state[-2]}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {state[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list = []
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run `collector` before each exposition, e.g. to copy external counters into gauges"""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and status", ("method", "route", "status"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+))
+http_request_db_commands = registry.register(Histogram(
+    "http_request_mongo_commands", "Mongo round trips per HTTP request", ("route",), buckets=COUNT_BUCKETS,
+))
+mongo_command_duration = registry.register(Histogram(
+    "mongo_command_duration_seconds", "Mongo command latency by collection and command", ("collection", "command"),
+))
+mongo_command_failures = registry.register(Counter(
+    "mongo_command_failures_total", "Failed Mongo commands by collection and command", ("collection", "command"),
+))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request by route template and status"""
+
+    def __init__(self, app):
+        self.app = app
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        commands = [0]
+        token = request_db_commands.set(commands)
+        self.in_flight += 1
+        http_requests_in_flight.set(value=self.in_flight)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            http_requests_in_flight.set(value=self.in_flight)
+            request_db_commands.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration.observe(elapsed, scope["method"], route_path, status[0])
+            http_request_db_commands.observe(commands[0], route_path)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every Mongo command by collection and command name"""
+
+    IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart", "saslContinue", "buildinfo", "buildInfo"}
+
+    def __init__(self):
+        self.collections: Dict[Tuple[int, int], str] = {}
+
+    def started(self, event):
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self.collections[(event.request_id, event.operation_id)] = target if isinstance(target, str) else ""
+        commands = request_db_commands.get()
+        if commands is not None:
+            commands[0] += 1
+
+    def succeeded(self, event):
+        collection = self.collections.pop((event.request_id, event.operation_id), None)
+        if collection is not None:
+            mongo_command_duration.observe(event.duration_micros / 1e6, collection, event.command_name)
+
+    def failed(self, event):
+        collection = self.collections.pop((event.request_id, event.operation_id), None)
+        if collection is not None:
+            mongo_command_duration.observe(event.duration_micros / 1e6, collection, event.command_name)
+            mongo_command_failures.inc(collection, event.command_name)
+
+
+mongo_pool_connections = registry.register(Gauge(
+    "mongo_pool_connections", "Pooled Mongo connections by state", ("state",),
+))
+mongo_pool_checkout_failures = registry.register(Counter(
+    "mongo_pool_checkout_failures_total", "Failed connection checkouts by reason", ("reason",),
+))
+
+
+class PoolListener(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections across this process's pools"""
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"open": self.open, "checked_out": self.checked_out}
+
+    def update(self, open_delta: int = 0, checked_out_delta: int = 0):
+        with self.lock:
+            self.open += open_delta
+            self.checked_out += checked_out_delta
+            mongo_pool_connections.set("open", value=self.open)
+            mongo_pool_connections.set("checked_out", value=self.checked_out)
+
+    def connection_created(self, event):
+        self.update(open_delta=1)
+
+    def connection_closed(self, event):
+        self.update(open_delta=-1)
+
+    def connection_checked_out(self, event):
+        self.update(checked_out_delta=1)
+
+    def connection_checked_in(self, event):
+        self.update(checked_out_delta=-1)
+
+    def connection_check_out_failed(self, event):
+        mongo_pool_checkout_failures.inc(str(event.reason))
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
@@ -0,0 +1,255 @@
+"""Admission control and rate limiting for the HTTP API.
+
+AdmissionMiddleware runs before routing, authentication and any endpoint work:
+
+- a per-process concurrency cap answers requests beyond `max_concurrent` with an
+  immediate 503 instead of letting them queue for the database pool;
+- token buckets keyed by user, API client or client IP answer callers that
+  exceed their rule's rate with 429 and a Retry-After header.
+
+Buckets live in process memory (each worker limits on its own, so the effective
+rate is per worker) or in a Mongo collection shared by every worker.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+requests_rejected = metrics.registry.register(metrics.Counter(
+    "http_requests_rejected_total", "Requests shed before reaching an endpoint, by reason and rule", ("reason", "rule"),
+))
+rate_limit_store_errors = metrics.registry.register(metrics.Counter(
+    "rate_limit_store_errors_total", "Rate limit checks that failed open because the bucket store errored",
+))
+
+
+class Rule:
+    """Allow `burst` requests at once, refilled at `per_minute`, on paths under `prefix`.
+
+    A `per_minute` of 0 or less leaves the matching requests unlimited. With `body_field`,
+    that field of the JSON body is part of the bucket key (the username for logins).
+    """
+
+    def __init__(self, name: str, prefix: str, per_minute: float, burst: int, methods: Optional[Iterable[str]] = None,
+                 body_field: Optional[str] = None):
+        self.name = name
+        self.prefix = prefix
+        self.rate = max(per_minute, 0) / 60.0
+        self.burst = burst
+        self.methods = set(methods) if methods else None
+        self.body_field = body_field
+
+    @property
+    def limited(self) -> bool:
+        return self.rate > 0
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.prefix) and (self.methods is None or method in self.methods)
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory, least recently used evicted beyond `max_keys`"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.buckets: OrderedDict = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; return 0 when allowed, otherwise seconds until a token is available"""
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+
+class MongoBucketStore:
+    """Token buckets shared by all workers, one document per key.
+
+    Refill and take happen in a single pipeline update, so concurrent workers never
+    both spend the last token. Documents expire once the bucket would be full again.
+    """
+
+    def __init__(self, collection: Callable[[], Any]):
+        self.collection = collection
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = datetime.utcnow()
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {"$min": [burst, {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, rate]}]}]}
+        bucket = await self.collection().find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": now + timedelta(seconds=burst / rate),
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rate
+
+
+def client_ip(scope, trust_forwarded: bool) -> str:
+    if trust_forwarded:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def header(scope, wanted: bytes) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == wanted:
+            return value.decode("latin-1")
+    return None
+
+
+async def read_body_field(receive, field: str, max_size: int = 64 * 1024) -> Tuple[Optional[str], Callable]:
+    """A string field of a JSON request body, and a receive callable that replays the body"""
+    messages = []
+    body = b""
+    while len(body) <= max_size:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    value = None
+    if len(body) <= max_size:
+        try:
+            value = json.loads(body).get(field)
+        except (ValueError, AttributeError):
+            pass
+    return (value if isinstance(value, str) else None), replay
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware shedding load before routing.
+
+    Each request matches the first rule whose prefix and method fit and spends one token
+    from a single bucket: its user's when it carries a valid bearer token, otherwise its
+    API client's (X-Client-Id header), otherwise its IP's. Rules with a body field key
+    the IP bucket by that field too, so users behind one NAT address do not share it.
+    Exempt paths (health checks, metrics, event streams) bypass both checks.
+    """
+
+    def __init__(
+        self,
+        app,
+        rules: List[Rule],
+        store=None,
+        max_concurrent: int = 0,
+        identify_user: Optional[Callable[[str], Optional[str]]] = None,
+        trust_forwarded: bool = False,
+        exempt_paths: Tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.rules = rules
+        self.store = store
+        self.max_concurrent = max_concurrent
+        self.identify_user = identify_user
+        self.trust_forwarded = trust_forwarded
+        self.exempt_paths = exempt_paths
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            requests_rejected.inc("overloaded", "")
+            await reject(send, 503, "Server is busy, please retry shortly", 1)
+            return
+        self.in_flight += 1
+        try:
+            rule = self.match(scope)
+            if rule is not None and rule.limited and self.store is not None:
+                field = None
+                if rule.body_field:
+                    field, receive = await read_body_field(receive, rule.body_field)
+                retry_after = await self.check(scope, rule, field)
+                if retry_after:
+                    requests_rejected.inc("rate_limited", rule.name)
+                    await reject(send, 429, "Too many requests", retry_after)
+                    return
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def match(self, scope) -> Optional[Rule]:
+        for rule in self.rules:
+            if rule.matches(scope["method"], scope["path"]):
+                return rule
+        return None
+
+    def bucket_key(self, scope, rule: Rule, field: Optional[str] = None) -> str:
+        ip = client_ip(scope, self.trust_forwarded)
+        if rule.body_field:
+            # Login: a client id must not buy extra guesses, so the address always counts
+            return f"{rule.name}:{rule.body_field}:{field or ''}:ip:{ip}"
+        authorization = header(scope, b"authorization")
+        if authorization and authorization.lower().startswith("bearer ") and self.identify_user:
+            user = self.identify_user(authorization[7:])
+            if user:
+                return f"{rule.name}:user:{user}"
+        api_client = header(scope, b"x-client-id")
+        if api_client:
+            return f"{rule.name}:client:{api_client}"
+        return f"{rule.name}:ip:{ip}"
+
+    async def check(self, scope, rule: Rule, field: Optional[str] = None) -> float:
+        """Seconds the caller should wait, or 0 when the request may proceed"""
+        key = self.bucket_key(scope, rule, field)
+        try:
+            return await self.store.take(key, rule.rate, rule.burst)
+        except PyMongoError as e:
+            # Fail open: an unavailable store must not turn into rejecting every request
+            rate_limit_store_errors.inc()
+            logger.warning(f"Rate limit check failed for {key}: {e}")
+            return 0.0
+
+
+async def reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, int(retry_after + 0.999))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
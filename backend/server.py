@@ -1,22 +1,122 @@
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime, timedelta
-import pymongo
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from typing import List, Optional, Dict, Any, Awaitable, Callable, Type, Union, Literal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import base64
+import hashlib
+import heapq
+import re
+import socket
+import tempfile
+from urllib.parse import quote
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+import asyncio
 import os
+import time
 import uuid
 import json
 import jwt
+import orjson
 from passlib.context import CryptContext
 import logging
+import metrics
+import ratelimit
+import settings
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Case Management System API")
+# Responses are rendered with orjson, which handles datetimes natively
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+app = FastAPI(title="Case Management System API", default_response_class=FastJSONResponse)
+
+# Database connection
+# Motor keeps every query off the event loop; pool, timeout, read preference and write
+# concern options come from settings.py. The client is created on startup rather than at
+# import, so every worker process opens its own pool after the server forks it.
+client: Optional[AsyncIOMotorClient] = None
+db = None
+pool_listener = metrics.PoolListener()
+
+def connect_database():
+    global client, db
+    if client is None:
+        client = AsyncIOMotorClient(
+            settings.MONGO_URL,
+            event_listeners=[metrics.MongoCommandListener(), pool_listener],
+            **settings.mongo_client_options(),
+        )
+        db = client[settings.MONGO_DB_NAME]
+
+# Security
+security = HTTPBearer()
+# Stored hashes whose cost differs from BCRYPT_ROUNDS are rehashed on the next successful login
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+# bcrypt is deliberately slow, so hashing runs on a bounded pool instead of the event loop.
+# The worker count caps how many hashes run at once (further requests queue) and defaults
+# to one less than the CPU count so the event loop always keeps a core.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(max(1, (os.cpu_count() or 2) - 1))))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+SECRET_KEY = "your-secret-key-change-in-production"
+ALGORITHM = "HS256"
+
+# Admission control
+# Requests are shed by ratelimit.AdmissionMiddleware before routing, authentication or any
+# database work: beyond MAX_CONCURRENT_REQUESTS in flight with 503, and over their token
+# bucket (by user, API client or IP) with 429. Login is limited hardest because every
+# attempt costs a bcrypt hash, per username and IP so users behind one NAT address do not
+# lock each other out; submission is unauthenticated, so it is limited per client or IP.
+def token_subject(token: str) -> Optional[str]:
+    """Username from a bearer token, verified but without a database lookup"""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except jwt.PyJWTError:
+        return None
+
+RATE_LIMIT_RULES = [
+    ratelimit.Rule("login", "/api/auth/login", settings.LOGIN_RATE_LIMIT_PER_MINUTE, settings.LOGIN_RATE_LIMIT_BURST, methods=["POST"],
+                   body_field="username"),
+    ratelimit.Rule("submit", "/api/cases/submit", settings.SUBMIT_RATE_LIMIT_PER_MINUTE, settings.SUBMIT_RATE_LIMIT_BURST, methods=["POST"]),
+    ratelimit.Rule("api", "/api/", settings.API_RATE_LIMIT_PER_MINUTE, settings.API_RATE_LIMIT_BURST),
+]
+
+def rate_limit_store():
+    if settings.RATE_LIMIT_BACKEND == "mongo":
+        return ratelimit.MongoBucketStore(lambda: db.rate_limits)
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return ratelimit.MemoryBucketStore()
+    return None
+
+app.add_middleware(
+    ratelimit.AdmissionMiddleware,
+    rules=RATE_LIMIT_RULES,
+    store=rate_limit_store(),
+    max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+    identify_user=token_subject,
+    trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED_FOR,
+    # Probes must answer under overload, and event streams hold a request open indefinitely
+    exempt_paths=("/api/health", "/metrics", "/api/cases/events"),
+)
+
+# Request latency and Mongo round-trip instrumentation, exposed at /metrics
+app.add_middleware(metrics.MetricsMiddleware)
 
 # CORS configuration
 app.add_middleware(
@@ -27,17 +127,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database connection
-MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
-client = pymongo.MongoClient(MONGO_URL)
-db = client.case_management
-
-# Security
-security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-SECRET_KEY = "your-secret-key-change-in-production"
-ALGORITHM = "HS256"
-
 # Pydantic Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -56,31 +145,137 @@ class CaseSubmission(BaseModel):
     submitted_by: str  # User ID or email
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
 
-class Case(BaseModel):
+class CaseSummary(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     case_type: str
     case_number: str  # Auto-generated case number
-    submitter_data: Dict[str, Any]
-    documents: List[str] = []
     status: str = "submitted"  # submitted, assigned, under_review, pending_documents, approved, rejected
     assigned_to: Optional[str] = None
     assigned_team: Optional[str] = None
-    workflow_history: List[Dict[str, Any]] = []
+    applicant_name: Optional[str] = None  # Taken from submitter_data by the case type schema
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class CaseDetail(CaseSummary):
+    submitter_data: Dict[str, Any]
+    documents: List[str] = []
+    workflow_history: List[Dict[str, Any]] = []  # Most recent entries only, see workflow_events
+    history_count: int = 0  # Total number of workflow events recorded for the case
+
+class Case(CaseDetail):
+    search_terms: List[str] = []  # Inverted-index terms, see case_search_terms
+    index_fields: Dict[str, str] = {}  # Normalized lookup keys, see CaseTypeSchema
+
+class CasePage(BaseModel):
+    items: List[Union[CaseDetail, CaseSummary]]
+    next_cursor: Optional[str] = None
+
 class WorkflowAction(BaseModel):
-    case_id: str
+    case_id: Optional[str] = None  # Redundant with the path parameter, kept for existing clients
     action: str  # assign, review, approve, reject, request_documents
     comment: Optional[str] = None
     assigned_to: Optional[str] = None
     assigned_team: Optional[str] = None
+    expected_status: Optional[str] = None  # Optimistic-concurrency guard on the current status
+
+class BulkWorkflowAction(WorkflowAction):
+    case_ids: List[str]
 
 class LoginRequest(BaseModel):
     username: str
     password: str
 
+class UserUpdate(BaseModel):
+    role: Optional[str] = None
+    team: Optional[str] = None
+    is_active: Optional[bool] = None
+
+class QueueClaim(BaseModel):
+    case_type: Optional[str] = None  # Only claim cases of this type
+
+class QueueDispatch(BaseModel):
+    role: str = "registrar_assistant"  # Staff role receiving the cases
+    team: Optional[str] = None  # Restrict assignees to one team
+    strategy: Literal["round_robin", "least_loaded"] = "least_loaded"
+    case_type: Optional[str] = None
+    limit: int = Field(50, ge=1, le=500)
+
+# In-process caches
+class TTLCache:
+    """Small LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+# The rendered active-user list and its ETag. Users rarely change and every write
+# through this process invalidates it; other workers serve it for at most the TTL.
+user_list_cache = TTLCache(max_size=1, ttl=settings.USER_LIST_CACHE_TTL_SECONDS)
+
+# Authenticated users keyed by token subject. Invalidation is per process, so other
+# workers pick up role or activation changes once their entry expires.
+user_cache = TTLCache(
+    max_size=int(os.environ.get('USER_CACHE_MAX_SIZE', '1024')),
+    ttl=float(os.environ.get('USER_CACHE_TTL_SECONDS', '30')),
+)
+
 # Authentication functions
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+async def verify_password(password: str, password_hash: str):
+    """Return (valid, new_hash); new_hash is set when the stored hash should be upgraded"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify_and_update, password, password_hash)
+
+# Hash of a random password at the current cost, made on first use
+dummy_password_hash: Optional[str] = None
+
+async def verify_dummy_password(password: str):
+    """Spend one bcrypt verification, as a login for an existing account would"""
+    global dummy_password_hash
+    if dummy_password_hash is None:
+        dummy_password_hash = await hash_password(uuid.uuid4().hex)
+    await verify_password(password, dummy_password_hash)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(hours=24)
@@ -88,22 +283,149 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        user = db.users.find_one({"username": username})
+        user = user_cache.get(username)
         if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
+            user = await db.users.find_one({"username": username}, {"password": 0})
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(username, user)
+        if not user.get("is_active", True):
+            raise HTTPException(status_code=401, detail="User is inactive")
         return user
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
+# Database indexes
+# One entry per query shape issued by the endpoints; applied idempotently at startup
+INDEX_MANIFEST = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+        IndexModel([("role", ASCENDING), ("team", ASCENDING), ("id", ASCENDING)], name="role_team_id"),
+    ],
+    "cases": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("case_number", ASCENDING)], name="case_number_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("assigned_to", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="assigned_to_created_at_id"),
+        IndexModel([("case_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="case_type_created_at_id"),
+        IndexModel([("search_terms", ASCENDING)], name="search_terms"),
+        IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)], name="status_updated_at"),
+        IndexModel([("index_fields.applicant_name", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="applicant_name_created_at_id"),
+        IndexModel([("index_fields.parcel_id", ASCENDING)], name="parcel_id", sparse=True),
+        IndexModel([("index_fields.business_name", ASCENDING)], name="business_name", sparse=True),
+        IndexModel([("index_fields.contact_email", ASCENDING)], name="contact_email", sparse=True),
+        IndexModel(
+            [("processing_pending", ASCENDING), ("created_at", ASCENDING)], name="processing_pending_created_at",
+            partialFilterExpression={"processing_pending": True},
+        ),
+    ],
+    "cases_archive": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("case_number", ASCENDING)], name="case_number_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("assigned_to", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="assigned_to_created_at_id"),
+        IndexModel([("case_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="case_type_created_at_id"),
+        IndexModel([("index_fields.applicant_name", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="applicant_name_created_at_id"),
+        IndexModel([("index_fields.parcel_id", ASCENDING)], name="parcel_id", sparse=True),
+    ],
+    "documents": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "workflow_events": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("case_id", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)], name="case_id_timestamp_id"),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("idempotency_key", ASCENDING)], name="idempotency_key_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+        IndexModel([("case_id", ASCENDING), ("created_at", DESCENDING)], name="case_id_created_at"),
+        IndexModel([("finished_at", ASCENDING)], name="finished_at_ttl", expireAfterSeconds=settings.JOB_RETENTION_SECONDS),
+    ],
+    "rate_limits": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+async def ensure_indexes():
+    for collection_name, indexes in INDEX_MANIFEST.items():
+        for index in indexes:
+            try:
+                await db[collection_name].create_indexes([index])
+            except OperationFailure as e:
+                # Conflicting specs or duplicate keys must not keep the API from starting
+                logger.error(f"Could not create index {collection_name}.{index.document['name']}: {e}")
+
+# Representative filters for every endpoint query, checked with explain() in query plan guard mode.
+# Aggregations over the whole collection (dashboard stats) are intentionally not listed.
+QUERY_SHAPES = [
+    ("login/current user", "users", {"username": "__probe__"}, None),
+    ("user list", "users", {"is_active": True}, None),
+    ("user update", "users", {"id": "__probe__"}, None),
+    ("case detail", "cases", {"$or": [{"id": "__probe__"}, {"case_number": "__probe__"}]}, None),
+    ("case list", "cases", {}, [("created_at", -1), ("id", -1)]),
+    ("case list (staff)", "cases", {"$or": [{"assigned_to": "__probe__"}, {"status": "submitted"}]}, [("created_at", -1), ("id", -1)]),
+    ("case list by status", "cases", {"status": "submitted"}, [("created_at", -1), ("id", -1)]),
+    ("case list by type", "cases", {"case_type": "birth_registration"}, [("created_at", -1), ("id", -1)]),
+    ("case list by assignee", "cases", {"assigned_to": "__probe__"}, [("created_at", -1), ("id", -1)]),
+    ("case search", "cases", {"search_terms": {"$all": ["__probe__"]}}, None),
+    ("case list by applicant", "cases", {"index_fields.applicant_name": "__probe__"}, [("created_at", -1), ("id", -1)]),
+    ("case list by parcel", "cases", {"index_fields.parcel_id": "__probe__"}, [("created_at", -1), ("id", -1)]),
+    ("case list by business", "cases", {"index_fields.business_name": "__probe__"}, [("created_at", -1), ("id", -1)]),
+    ("case list by email", "cases", {"index_fields.contact_email": "__probe__"}, [("created_at", -1), ("id", -1)]),
+    ("archiver", "cases", {"status": {"$in": ["approved", "rejected"]}, "updated_at": {"$lt": datetime(2000, 1, 1)}}, None),
+    ("archived case detail", "cases_archive", {"$or": [{"id": "__probe__"}, {"case_number": "__probe__"}]}, None),
+    ("archived case list", "cases_archive", {}, [("created_at", -1), ("id", -1)]),
+    ("queue claim", "cases", {"status": "submitted", "assigned_to": None}, [("created_at", 1), ("id", 1)]),
+    ("queue staff", "users", {"role": "__probe__", "is_active": True}, [("id", 1)]),
+    ("document metadata", "documents", {"id": "__probe__"}, None),
+    ("case history", "workflow_events", {"case_id": "__probe__"}, [("timestamp", -1), ("id", -1)]),
+    ("job status", "jobs", {"id": "__probe__"}, None),
+    ("case jobs", "jobs", {"case_id": "__probe__"}, [("created_at", -1)]),
+    ("pending case sweep", "cases", {"processing_pending": True, "created_at": {"$lt": datetime(2000, 1, 1)}}, None),
+    ("job claim", "jobs", {"status": "pending", "run_at": {"$lte": datetime(2000, 1, 1)}}, [("run_at", 1)]),
+]
+
+def plan_stages(plan) -> set:
+    """Collect every stage name in an explain() plan tree"""
+    stages = set()
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages |= plan_stages(item)
+    return stages
+
+async def check_query_plans():
+    """Raise if any endpoint query shape resolves to a collection scan"""
+    offenders = []
+    for name, collection_name, filter_query, sort in QUERY_SHAPES:
+        cursor = db[collection_name].find(filter_query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        if "COLLSCAN" in plan_stages(explanation["queryPlanner"]["winningPlan"]):
+            offenders.append(name)
+    if offenders:
+        raise RuntimeError(f"Queries resolved to COLLSCAN: {', '.join(offenders)}")
+    logger.info(f"Query plan guard passed for {len(QUERY_SHAPES)} query shapes")
+
 # Initialize default users if not exists
-def init_default_users():
+async def init_default_users():
     default_users = [
         {"username": "admin", "password": "admin123", "full_name": "Administrator", "email": "admin@system.com", "role": "supervisor"},
         {"username": "registrar1", "password": "reg123", "full_name": "Main Registrar", "email": "registrar@system.com", "role": "registrar"},
@@ -112,45 +434,731 @@ def init_default_users():
     ]
     
     for user_data in default_users:
-        if not db.users.find_one({"username": user_data["username"]}):
+        if not await db.users.find_one({"username": user_data["username"]}):
             user = User(
                 username=user_data["username"],
                 full_name=user_data["full_name"],
                 email=user_data["email"],
                 role=user_data["role"]
             )
-            user_dict = user.dict()
-            user_dict["password"] = pwd_context.hash(user_data["password"])
-            db.users.insert_one(user_dict)
+            user_dict = user.model_dump()
+            user_dict["password"] = await hash_password(user_data["password"])
+            try:
+                await db.users.insert_one(user_dict)
+            except DuplicateKeyError:
+                continue  # Created by another worker starting at the same time
+            user_list_cache.invalidate()
             logger.info(f"Created default user: {user_data['username']}")
 
+# One-time data migrations, recorded in db.migrations. Migrations must be idempotent
+# because several workers may start at once and run the same one concurrently.
+async def run_migration(name: str, migration):
+    if await db.migrations.find_one({"_id": name}):
+        return
+    await migration()
+    try:
+        await db.migrations.insert_one({"_id": name, "applied_at": datetime.utcnow()})
+    except DuplicateKeyError:
+        pass
+    logger.info(f"Applied migration: {name}")
+
+# Case type schemas
+# Every case type registers a pydantic model for its submitter_data. Submissions are
+# validated and normalized against it before anything is written, and the schema names
+# the fields copied into indexed top-level keys (index_fields, lowercased) so listings
+# can filter by applicant or parcel without reading submitter_data. Models are built
+# once at import; new types can be added with register_case_type before startup.
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+class SubmitterData(BaseModel):
+    # Forms may carry fields beyond the schema; they are kept as submitted
+    model_config = ConfigDict(extra="allow", str_strip_whitespace=True)
+    contact_email: Optional[str] = Field(None, pattern=EMAIL_PATTERN)
+
+class BirthRegistrationData(SubmitterData):
+    child_name: str = Field(min_length=1)
+    date_of_birth: Optional[date] = None
+    place_of_birth: Optional[str] = None
+    mother_name: Optional[str] = None
+    father_name: Optional[str] = None
+
+class BusinessRegistrationData(SubmitterData):
+    business_name: str = Field(min_length=1)
+    business_type: Optional[str] = None
+    owner_name: Optional[str] = None
+    partners: List[str] = []
+    business_address: Optional[str] = None
+
+class LandRegistrationData(SubmitterData):
+    owner_name: str = Field(min_length=1)
+    parcel_id: Optional[str] = None
+    property_address: Optional[str] = None
+    property_size: Optional[str] = None
+    previous_owner: Optional[str] = None
+
+def normalize_key(value: Any) -> str:
+    return " ".join(str(value).split()).lower()
+
+class CaseTypeSchema:
+    def __init__(self, case_type: str, prefix: str, model: Type[SubmitterData], applicant_field: str,
+                 index_fields: Dict[str, str], searchable_fields: List[str]):
+        self.case_type = case_type
+        self.prefix = prefix
+        self.model = model
+        self.applicant_field = applicant_field
+        self.index_fields = index_fields  # index key -> submitter_data field
+        self.searchable_fields = searchable_fields
+        self.json_schema = model.model_json_schema()
+
+    def normalize(self, submitter_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validated submitter_data with JSON-ready values; raises ValidationError"""
+        return self.model.model_validate(submitter_data).model_dump(mode="json", exclude_unset=True)
+
+    def applicant_name(self, submitter_data: Dict[str, Any]) -> Optional[str]:
+        value = submitter_data.get(self.applicant_field)
+        return " ".join(value.split()) if isinstance(value, str) and value.strip() else None
+
+    def index_values(self, submitter_data: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            key: normalize_key(submitter_data[field])
+            for key, field in self.index_fields.items()
+            if isinstance(submitter_data.get(field), (str, int)) and str(submitter_data[field]).strip()
+        }
+
+CASE_TYPES: Dict[str, CaseTypeSchema] = {}
+CASE_NUMBER_PREFIXES: Dict[str, str] = {}
+CASE_TYPE_MIGRATION_BATCH_SIZE = 1000
+
+def register_case_type(case_type: str, prefix: str, model: Type[SubmitterData], applicant_field: str,
+                       index_fields: Optional[Dict[str, str]] = None, searchable_fields: Optional[List[str]] = None):
+    CASE_TYPES[case_type] = CaseTypeSchema(
+        case_type, prefix, model, applicant_field,
+        {"applicant_name": applicant_field, "contact_email": "contact_email", **(index_fields or {})},
+        searchable_fields or [applicant_field, "contact_email"],
+    )
+    CASE_NUMBER_PREFIXES[case_type] = prefix
+
+register_case_type(
+    "birth_registration", "BR", BirthRegistrationData, "child_name",
+    searchable_fields=["child_name", "mother_name", "father_name", "contact_email"],
+)
+register_case_type(
+    "business_registration", "BUS", BusinessRegistrationData, "owner_name",
+    index_fields={"business_name": "business_name"},
+    searchable_fields=["business_name", "owner_name", "partners", "contact_email"],
+)
+register_case_type(
+    "land_registration", "LAND", LandRegistrationData, "owner_name",
+    index_fields={"parcel_id": "parcel_id"},
+    searchable_fields=["owner_name", "previous_owner", "parcel_id", "property_address", "contact_email"],
+)
+
+# Case types without a registered schema are still accepted, as before schemas existed: their
+# submitter_data is only checked against the common fields and kept as submitted.
+GENERIC_CASE_TYPE = CaseTypeSchema(
+    "generic", "CASE", SubmitterData, "applicant_name",
+    {"applicant_name": "applicant_name", "contact_email": "contact_email"}, ["applicant_name", "contact_email"],
+)
+
+def case_type_schema(case_type: Optional[str]) -> CaseTypeSchema:
+    return CASE_TYPES.get(case_type) or GENERIC_CASE_TYPE
+
+def validate_submitter_data(case_submission: CaseSubmission) -> Optional[List[dict]]:
+    """Normalize submitter_data in place, or return errors located within the submission"""
+    schema = case_type_schema(case_submission.case_type)
+    try:
+        case_submission.submitter_data = schema.normalize(case_submission.submitter_data)
+    except ValidationError as e:
+        return [
+            {"type": error["type"], "loc": ["submitter_data", *error["loc"]], "msg": error["msg"]}
+            for error in e.errors()
+        ]
+    return None
+
+async def backfill_index_fields():
+    """Derive applicant_name and index_fields for cases stored before case type schemas.
+    Changes the case summaries, hence CASE_ETAG_VERSION 2."""
+    while True:
+        cases = await db.cases.find(
+            {"index_fields": {"$exists": False}},
+            {"id": 1, "case_type": 1, "submitter_data": 1},
+        ).limit(CASE_TYPE_MIGRATION_BATCH_SIZE).to_list(length=None)
+        if not cases:
+            return
+        for case in cases:
+            schema = case_type_schema(case.get("case_type"))
+            submitter_data = case.get("submitter_data") or {}
+            await db.cases.update_one({"id": case["id"]}, {"$set": {
+                "applicant_name": schema.applicant_name(submitter_data),
+                "index_fields": schema.index_values(submitter_data),
+            }})
+        logger.info(f"Derived index fields of {len(cases)} cases")
+
+@app.get("/api/case-types")
+async def get_case_types():
+    """Case types accepted for submission, with the JSON schema of their submitter_data"""
+    return {
+        case_type: {"prefix": schema.prefix, "schema": schema.json_schema}
+        for case_type, schema in CASE_TYPES.items()
+    }
+
 # Generate case number
-def generate_case_number(case_type: str):
+# Sequences live in db.counters, one document per (case_type, year), and are
+# reserved with a single atomic $inc. With CASE_NUMBER_BLOCK_SIZE > 1 each worker
+# reserves a block of numbers at a time, trading strict ordering for less contention.
+CASE_NUMBER_BLOCK_SIZE = int(os.environ.get('CASE_NUMBER_BLOCK_SIZE', '1'))
+case_number_blocks: Dict[tuple, List[int]] = {}
+case_number_lock = asyncio.Lock()
+
+def format_case_number(case_type: str, year: int, sequence: int) -> str:
+    prefix = CASE_NUMBER_PREFIXES.get(case_type, "CASE")
+    return f"{prefix}-{year}-{sequence:04d}"
+
+def counter_key(case_type: str, year) -> str:
+    # Types without a schema share the CASE prefix, so they share one sequence too
+    return f"{case_type if case_type in CASE_NUMBER_PREFIXES else GENERIC_CASE_TYPE.case_type}:{year}"
+
+async def reserve_case_sequence(case_type: str, year: int, count: int = 1) -> int:
+    """Atomically reserve `count` consecutive sequence numbers and return the first"""
+    counter = await db.counters.find_one_and_update(
+        {"_id": counter_key(case_type, year)},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"] - count + 1
+
+async def generate_case_number(case_type: str):
     year = datetime.utcnow().year
-    prefix_map = {
-        "birth_registration": "BR",
-        "business_registration": "BUS",
-        "land_registration": "LAND"
+    if CASE_NUMBER_BLOCK_SIZE <= 1:
+        return format_case_number(case_type, year, await reserve_case_sequence(case_type, year))
+
+    async with case_number_lock:
+        block = case_number_blocks.get((case_type, year))
+        if block is None or block[0] > block[1]:
+            start = await reserve_case_sequence(case_type, year, CASE_NUMBER_BLOCK_SIZE)
+            block = [start, start + CASE_NUMBER_BLOCK_SIZE - 1]
+            case_number_blocks[(case_type, year)] = block
+        sequence = block[0]
+        block[0] += 1
+    return format_case_number(case_type, year, sequence)
+
+async def seed_case_counters():
+    """Start each counter after the highest case number already issued for it"""
+    pipeline = [
+        {"$project": {
+            "case_type": 1,
+            "parts": {"$split": ["$case_number", "-"]},
+        }},
+        {"$group": {
+            "_id": {"case_type": "$case_type", "year": {"$arrayElemAt": ["$parts", 1]}},
+            "max_seq": {"$max": {"$toInt": {"$arrayElemAt": ["$parts", -1]}}},
+        }},
+    ]
+    async for item in db.cases.aggregate(pipeline):
+        key = counter_key(item["_id"]["case_type"], item["_id"]["year"])
+        await db.counters.update_one({"_id": key}, {"$max": {"seq": item["max_seq"]}}, upsert=True)
+
+# Workflow history
+# Every workflow event is stored in db.workflow_events; the case document only keeps
+# the last WORKFLOW_HISTORY_INLINE_LIMIT entries so it stays small however long the case lives.
+WORKFLOW_HISTORY_INLINE_LIMIT = int(os.environ.get('WORKFLOW_HISTORY_INLINE_LIMIT', '10'))
+HISTORY_MIGRATION_BATCH_SIZE = 500
+
+def workflow_event(case_id: str, entry: dict, event_id: Optional[str] = None) -> dict:
+    return {"id": event_id or str(uuid.uuid4()), "case_id": case_id, **entry}
+
+async def record_workflow_events(events: List[dict]):
+    if not events:
+        return
+    try:
+        await db.workflow_events.insert_many(events, ordered=False)
+    except BulkWriteError as e:
+        # Duplicate ids come from re-running the history migration and are expected
+        errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != 11000]
+        if errors:
+            logger.error(f"Error recording workflow events: {errors[0].get('errmsg')}")
+
+async def migrate_workflow_history():
+    """Copy inline histories into workflow_events and trim the case documents, in batches"""
+    while True:
+        cases = await db.cases.find(
+            {"history_migrated": {"$ne": True}},
+            {"id": 1, "workflow_history": 1},
+        ).limit(HISTORY_MIGRATION_BATCH_SIZE).to_list(length=None)
+        if not cases:
+            return
+        case_ids = [case["id"] for case in cases]
+        # A transition applied before the migration reached a case has already recorded its
+        # event (and bumped history_count), so entries found in workflow_events are skipped
+        recorded = {
+            (event["case_id"], event["action"], event["timestamp"])
+            async for event in db.workflow_events.find({"case_id": {"$in": case_ids}}, {"case_id": 1, "action": 1, "timestamp": 1})
+        }
+        events = [
+            # Deterministic ids keep the migration idempotent
+            workflow_event(case["id"], entry, event_id=f"{case['id']}:{position}")
+            for case in cases
+            for position, entry in enumerate(case.get("workflow_history", []))
+            if (case["id"], entry.get("action"), entry.get("timestamp")) not in recorded
+        ]
+        await record_workflow_events(events)
+        counts = {
+            item["_id"]: item["count"]
+            async for item in db.workflow_events.aggregate([
+                {"$match": {"case_id": {"$in": case_ids}}},
+                {"$group": {"_id": "$case_id", "count": {"$sum": 1}}},
+            ])
+        }
+        for case_id in case_ids:
+            # Trim in place and never lower the count, so a concurrent transition isn't undone
+            await db.cases.update_one({"id": case_id}, {
+                "$push": {"workflow_history": {"$each": [], "$slice": -WORKFLOW_HISTORY_INLINE_LIMIT}},
+                "$max": {"history_count": counts.get(case_id, 0)},
+                "$set": {"history_migrated": True},
+            })
+        logger.info(f"Moved workflow history of {len(cases)} cases")
+
+# Case search
+# Each case carries a search_terms array built from its case number and the submitter_data
+# fields its case type schema marks searchable. The multikey index on it acts as an
+# inverted index. Cases of unregistered types fall back to the fields below.
+SEARCHABLE_SUBMITTER_FIELDS = [
+    "applicant_name", "child_name", "mother_name", "father_name", "owner_name",
+    "business_name", "partners", "previous_owner", "parcel_id", "property_address",
+    "contact_email",
+]
+SEARCH_MIGRATION_BATCH_SIZE = 1000
+
+def text_terms(text: str) -> set:
+    """Lowercased words, plus whole tokens such as IDs and emails that contain separators"""
+    terms = set()
+    for piece in text.lower().split():
+        piece = piece.strip(".,;:!?()[]\"'")
+        words = re.findall(r"\w+", piece)
+        terms.update(words)
+        if len(words) > 1:
+            terms.add(piece)
+    return terms
+
+def query_terms(query: str) -> List[str]:
+    """One term per whitespace-separated piece of a search query"""
+    terms = []
+    for piece in query.lower().split():
+        piece = piece.strip(".,;:!?()[]\"'")
+        words = re.findall(r"\w+", piece)
+        if words:
+            terms.append(piece if len(words) > 1 else words[0])
+    return terms
+
+def collect_strings(value) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [text for item in value.values() for text in collect_strings(item)]
+    if isinstance(value, list):
+        return [text for item in value for text in collect_strings(item)]
+    return []
+
+def case_search_terms(case_number: str, submitter_data: Dict[str, Any], case_type: Optional[str] = None) -> List[str]:
+    schema = CASE_TYPES.get(case_type)
+    terms = text_terms(case_number)
+    for field in schema.searchable_fields if schema else SEARCHABLE_SUBMITTER_FIELDS:
+        for text in collect_strings(submitter_data.get(field)):
+            terms |= text_terms(text)
+    return sorted(terms)
+
+async def backfill_search_terms():
+    while True:
+        cases = await db.cases.find(
+            {"search_terms": {"$exists": False}},
+            {"id": 1, "case_type": 1, "case_number": 1, "submitter_data": 1},
+        ).limit(SEARCH_MIGRATION_BATCH_SIZE).to_list(length=None)
+        if not cases:
+            return
+        for case in cases:
+            terms = case_search_terms(case.get("case_number", ""), case.get("submitter_data") or {}, case.get("case_type"))
+            await db.cases.update_one({"id": case["id"]}, {"$set": {"search_terms": terms}})
+        logger.info(f"Indexed search terms of {len(cases)} cases")
+
+# Dashboard statistics
+# A single db.stats document holds case counts by status, type and assignee. It is
+# kept current with $inc on every submission and transition, and periodically
+# recomputed from the cases collection to correct any drift.
+STATS_DOC_ID = "cases"
+STATS_RECONCILE_INTERVAL_SECONDS = int(os.environ.get('STATS_RECONCILE_INTERVAL_SECONDS', '300'))
+
+async def increment_stats(increments: Dict[str, int]):
+    increments = {key: value for key, value in increments.items() if value}
+    if not increments:
+        return
+    try:
+        await db.stats.update_one({"_id": STATS_DOC_ID}, {"$inc": increments}, upsert=True)
+    except Exception as e:
+        # Stats are secondary to the case write; reconciliation repairs them
+        logger.error(f"Error updating dashboard stats: {str(e)}")
+
+def transition_stats_delta(before: dict, after: dict) -> Dict[str, int]:
+    delta: Dict[str, int] = {}
+    if before["status"] != after["status"]:
+        delta[f"by_status.{before['status']}"] = -1
+        delta[f"by_status.{after['status']}"] = 1
+    if before.get("assigned_to") != after.get("assigned_to"):
+        if before.get("assigned_to"):
+            delta[f"by_assignee.{before['assigned_to']}"] = -1
+        if after.get("assigned_to"):
+            delta[f"by_assignee.{after['assigned_to']}"] = 1
+    return delta
+
+async def compute_live_stats() -> dict:
+    """Counts over active and archived cases, so archiving does not change the dashboard"""
+    pipeline = [{"$facet": {
+        "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+        "by_type": [{"$group": {"_id": "$case_type", "count": {"$sum": 1}}}],
+        "by_assignee": [
+            {"$match": {"assigned_to": {"$ne": None}}},
+            {"$group": {"_id": "$assigned_to", "count": {"$sum": 1}}},
+        ],
+    }}]
+    stats: Dict[str, Dict[str, int]] = {}
+    for collection in (db.cases, db.cases_archive):
+        result = (await collection.aggregate(pipeline).to_list(length=None))[0]
+        for group, items in result.items():
+            counts = stats.setdefault(group, {})
+            for item in items:
+                counts[item["_id"]] = counts.get(item["_id"], 0) + item["count"]
+    return stats
+
+async def reconcile_stats() -> dict:
+    # Increments landing between the aggregation and the write are lost until the next run
+    stats = await compute_live_stats()
+    await db.stats.replace_one(
+        {"_id": STATS_DOC_ID},
+        {**stats, "reconciled_at": datetime.utcnow()},
+        upsert=True,
+    )
+    return stats
+
+async def stats_reconciler():
+    while True:
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL_SECONDS)
+        try:
+            await reconcile_stats()
+        except Exception as e:
+            logger.error(f"Error reconciling dashboard stats: {str(e)}")
+
+# Case archival
+# Approved and rejected cases untouched for ARCHIVE_AFTER_DAYS are moved to db.cases_archive
+# so listings and aggregations over db.cases scale with active work. Archived cases are
+# read-only: detail, history and documents read through to the archive, listings include
+# them on request, and dashboard stats count both collections.
+CLOSED_STATUSES = ["approved", "rejected"]
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '180'))  # 0 disables archival
+ARCHIVE_INTERVAL_SECONDS = int(os.environ.get('ARCHIVE_INTERVAL_SECONDS', '3600'))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '500'))
+
+async def archive_closed_cases() -> int:
+    """Move one batch at a time; the archive copy is written before the original is deleted"""
+    cutoff = datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    filter_query = {"status": {"$in": CLOSED_STATUSES}, "updated_at": {"$lt": cutoff}}
+    archived = 0
+    while True:
+        cases = await db.cases.find(filter_query).limit(ARCHIVE_BATCH_SIZE).to_list(length=None)
+        if not cases:
+            break
+        now = datetime.utcnow()
+        for case in cases:
+            case["archived_at"] = now
+        # Upserts overwrite copies left behind by an interrupted run
+        await db.cases_archive.bulk_write(
+            [ReplaceOne({"id": case["id"]}, case, upsert=True) for case in cases], ordered=False
+        )
+        ids = [case["id"] for case in cases]
+        result = await db.cases.delete_many({"id": {"$in": ids}, **filter_query})
+        archived += result.deleted_count
+        if result.deleted_count < len(ids):
+            # Cases touched since they were read stay active; drop their archive copies
+            active = [case["id"] async for case in db.cases.find({"id": {"$in": ids}}, {"id": 1})]
+            await db.cases_archive.delete_many({"id": {"$in": active}})
+    if archived:
+        logger.info(f"Archived {archived} closed cases")
+    return archived
+
+async def case_archiver():
+    while True:
+        try:
+            await archive_closed_cases()
+        except Exception as e:
+            logger.error(f"Error archiving closed cases: {str(e)}")
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+async def find_case(case_key: str, projection: Optional[dict] = None) -> Optional[dict]:
+    """Look a case up by id or case number, reading through to the archive"""
+    filter_query = {"$or": [{"id": case_key}, {"case_number": case_key}]}
+    case = await db.cases.find_one(filter_query, projection)
+    if case is None:
+        case = await db.cases_archive.find_one(filter_query, projection)
+    return case
+
+# Case change feed
+# Case writes are published to an in-process broker that fans them out to the
+# server-sent event streams of connected dashboards. With CASE_EVENTS_SOURCE=change_stream
+# a Mongo change stream (replica set required) feeds the broker instead, so clients
+# connected to any worker see writes made by every worker.
+CASE_EVENTS_SOURCE = os.environ.get('CASE_EVENTS_SOURCE', 'local')
+CASE_EVENTS_QUEUE_SIZE = int(os.environ.get('CASE_EVENTS_QUEUE_SIZE', '1000'))
+CASE_EVENTS_KEEPALIVE_SECONDS = 15
+
+class CaseEventSubscriber:
+    def __init__(self, user: dict):
+        self.user = user
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CASE_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+class CaseEventBroker:
+    def __init__(self):
+        self.subscribers: set = set()
+
+    def subscribe(self, user: dict) -> CaseEventSubscriber:
+        subscriber = CaseEventSubscriber(user)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: CaseEventSubscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, case: dict, previous: Optional[dict] = None, created: bool = False):
+        """Queue a case change for every subscriber allowed to see it"""
+        summary = case_summary(case)
+        for subscriber in list(self.subscribers):
+            if case_visible_to(subscriber.user, case):
+                event = ("case_created" if created else "case_updated", summary)
+            elif not created and (previous is None or case_visible_to(subscriber.user, previous)):
+                # The case left this user's view; without a previous state we cannot tell, so say so anyway
+                event = ("case_removed", {"id": case["id"]})
+            else:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client this far behind must reload instead of replaying deltas
+                subscriber.overflowed = True
+                self.unsubscribe(subscriber)
+
+case_events = CaseEventBroker()
+
+def publish_case_event(case: dict, previous: Optional[dict] = None):
+    if CASE_EVENTS_SOURCE == "local":
+        case_events.publish(case, previous, created=previous is None)
+
+async def watch_case_changes():
+    """Feed the broker from a Mongo change stream on db.cases"""
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+    while True:
+        try:
+            async with db.cases.watch(pipeline, full_document="updateLookup") as stream:
+                async for change in stream:
+                    case = change.get("fullDocument")
+                    if case:
+                        case_events.publish(case, created=change["operationType"] == "insert")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Case change stream failed, restarting: {str(e)}")
+            await asyncio.sleep(5)
+
+# Background jobs
+# Follow-up work after a write is queued in db.jobs instead of running in the request.
+# Consumers claim a job with a lease (find_one_and_update), so a job whose consumer dies
+# is picked up again once the lease expires. Failures are retried with exponential
+# backoff up to JOB_MAX_ATTEMPTS. The idempotency key (one case_submitted job per case)
+# makes enqueueing safe to repeat, and handlers record each finished step so a retry
+# skips what an earlier attempt completed. New cases are stored with processing_pending
+# until their job has run, so a case saved without its job (a crash or a failed enqueue
+# after the insert) is queued by the sweeper. JOB_WORKERS consumers run in every API
+# process; set it to 0 and run `python worker.py` to consume in dedicated processes.
+JOB_HANDLERS: Dict[str, Callable[[dict], Awaitable[None]]] = {}
+job_wakeup = asyncio.Event()  # Set on enqueue so local consumers start without waiting for a poll
+JOB_SWEEP_BATCH_SIZE = 1000  # Case ids per jobs insert_many in a sweep
+
+def job_handler(job_type: str):
+    def register(handler):
+        JOB_HANDLERS[job_type] = handler
+        return handler
+    return register
+
+def job_document(job_type: str, case_id: str, idempotency_key: Optional[str] = None) -> dict:
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "type": job_type,
+        "case_id": case_id,
+        "idempotency_key": idempotency_key or f"{job_type}:{case_id}",
+        "status": "pending",
+        "attempts": 0,
+        "max_attempts": settings.JOB_MAX_ATTEMPTS,
+        "run_at": now,
+        "completed_steps": [],
+        "last_error": None,
+        "created_at": now,
+        "updated_at": now,
     }
-    prefix = prefix_map.get(case_type, "CASE")
-    
-    # Get count of cases this year for this type
-    count = db.cases.count_documents({
-        "case_type": case_type,
-        "created_at": {"$gte": datetime(year, 1, 1)}
-    })
-    
-    return f"{prefix}-{year}-{count + 1:04d}"
+
+async def enqueue_job(job_type: str, case_id: str, idempotency_key: Optional[str] = None) -> str:
+    """Queue a job and return its id; an existing job with the same key is returned instead"""
+    job = job_document(job_type, case_id, idempotency_key)
+    try:
+        await db.jobs.insert_one(job)
+    except DuplicateKeyError:
+        existing = await db.jobs.find_one({"idempotency_key": job["idempotency_key"]}, {"id": 1})
+        return existing["id"]
+    job_wakeup.set()
+    return job["id"]
+
+async def enqueue_jobs(job_type: str, case_ids: List[str]):
+    """Queue one job per case with a single insert; cases that already have one keep it"""
+    if not case_ids:
+        return
+    try:
+        await db.jobs.insert_many([job_document(job_type, case_id) for case_id in case_ids], ordered=False)
+    except BulkWriteError as e:
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+    job_wakeup.set()
+
+async def job_step(job: dict, step: str, action: Callable[[], Awaitable[Any]]):
+    """Run one step of a handler unless a previous attempt already completed it"""
+    if step in job["completed_steps"]:
+        return
+    await action()
+    await db.jobs.update_one({"id": job["id"]}, {"$addToSet": {"completed_steps": step}})
+    job["completed_steps"].append(step)
+
+@job_handler("case_submitted")
+async def process_submitted_case(job: dict):
+    """Record the submission in the case history, then clear the case's processing_pending flag"""
+    case = await db.cases.find_one({"id": job["case_id"]}, {"id": 1, "case_type": 1, "workflow_history": 1})
+    if case is None:
+        raise ValueError(f"Case {job['case_id']} not found")
+    entry = next((entry for entry in case.get("workflow_history", []) if entry["action"] == "submitted"), None)
+    if entry is not None:
+        # Same event id as the history migration uses for a case's first entry
+        await job_step(job, "history", lambda: record_workflow_events([
+            workflow_event(case["id"], entry, event_id=f"{case['id']}:0")
+        ]))
+    await db.cases.update_one({"id": case["id"]}, {"$unset": {"processing_pending": ""}})
+
+async def sweep_pending_cases() -> int:
+    """Queue the case_submitted job of every case still flagged a sweep interval after creation"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_SWEEP_INTERVAL_SECONDS)
+    swept = 0
+    case_ids = []
+    async for case in db.cases.find({"processing_pending": True, "created_at": {"$lt": cutoff}}, {"id": 1}):
+        case_ids.append(case["id"])
+        if len(case_ids) >= JOB_SWEEP_BATCH_SIZE:
+            await enqueue_jobs("case_submitted", case_ids)
+            swept += len(case_ids)
+            case_ids = []
+    await enqueue_jobs("case_submitted", case_ids)
+    return swept + len(case_ids)
+
+async def pending_case_sweeper():
+    while True:
+        await asyncio.sleep(settings.JOB_SWEEP_INTERVAL_SECONDS)
+        try:
+            swept = await sweep_pending_cases()
+            if swept:
+                logger.info(f"Swept {swept} cases pending processing")
+        except Exception as e:
+            logger.error(f"Error sweeping cases pending processing: {str(e)}")
+
+async def claim_job(worker_id: str) -> Optional[dict]:
+    now = datetime.utcnow()
+    job = await db.jobs.find_one_and_update(
+        {"$or": [
+            {"status": "pending", "run_at": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lt": now}},  # Consumer died mid-job
+        ]},
+        {
+            "$set": {"status": "running", "locked_by": worker_id, "locked_until": now + timedelta(seconds=settings.JOB_LEASE_SECONDS), "updated_at": now},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if job:
+        job.pop("_id", None)
+    return job
+
+async def run_job(job: dict, worker_id: str):
+    handler = JOB_HANDLERS.get(job["type"])
+    now = datetime.utcnow()
+    try:
+        if handler is None:
+            raise ValueError(f"No handler for job type {job['type']}")
+        if job["attempts"] > job["max_attempts"]:
+            raise ValueError("Lease expired on the final attempt")
+        await handler(job)
+    except Exception as e:
+        if job["attempts"] >= job["max_attempts"]:
+            update = {"status": "failed", "finished_at": now}
+            logger.error(f"Job {job['id']} ({job['type']}) failed permanently: {str(e)}")
+        else:
+            delay = min(settings.JOB_RETRY_MAX_SECONDS, settings.JOB_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1))
+            update = {"status": "pending", "run_at": now + timedelta(seconds=delay)}
+            logger.warning(f"Job {job['id']} ({job['type']}) failed, retrying in {delay:.0f}s: {str(e)}")
+        await db.jobs.update_one(
+            {"id": job["id"], "locked_by": worker_id},
+            {"$set": {**update, "last_error": str(e), "updated_at": now}, "$unset": {"locked_until": ""}},
+        )
+        return
+    await db.jobs.update_one(
+        {"id": job["id"], "locked_by": worker_id},
+        {"$set": {"status": "succeeded", "finished_at": now, "last_error": None, "updated_at": now}, "$unset": {"locked_until": ""}},
+    )
+
+async def job_worker(worker_id: str):
+    while True:
+        try:
+            job = await claim_job(worker_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error claiming job: {str(e)}")
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+            continue
+        if job is None:
+            job_wakeup.clear()
+            try:
+                await asyncio.wait_for(job_wakeup.wait(), settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await run_job(job, worker_id)
+
+def job_worker_id(index: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
 
 # API Endpoints
 
 @app.post("/api/auth/login")
 async def login(login_data: LoginRequest):
-    user = db.users.find_one({"username": login_data.username})
-    if not user or not pwd_context.verify(login_data.password, user["password"]):
+    user = await db.users.find_one({"username": login_data.username})
+    # Unknown and inactive accounts never reach the stored hash or a rehash write. They are
+    # checked against a dummy hash instead, so they take as long as a wrong password and get
+    # the same answer.
+    if not user or not user.get("is_active", True):
+        await verify_dummy_password(login_data.password)
+        raise HTTPException(status_code=401, detail="Incorrect username or password")
+    valid, new_hash = await verify_password(login_data.password, user["password"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
+    if new_hash:
+        await db.users.update_one({"id": user["id"]}, {"$set": {"password": new_hash}})
+        logger.info(f"Rehashed password for {user['username']}")
     
-    access_token = create_access_token(data={"sub": user["username"]})
+    # id and role are informational claims for clients; authorization always uses the stored user
+    access_token = create_access_token(data={"sub": user["username"], "uid": user["id"], "role": user["role"]})
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -162,67 +1170,381 @@ async def login(login_data: LoginRequest):
         }
     }
 
+def case_document(case: Case) -> dict:
+    """A new case as stored, flagged until its case_submitted job has run"""
+    return {**case.model_dump(), "processing_pending": True}
+
+def build_case(case_submission: CaseSubmission, case_number: str) -> Case:
+    """A new case from a submission already normalized by validate_submitter_data"""
+    schema = case_type_schema(case_submission.case_type)
+    return Case(
+        case_type=case_submission.case_type,
+        case_number=case_number,
+        submitter_data=case_submission.submitter_data,
+        applicant_name=schema.applicant_name(case_submission.submitter_data),
+        index_fields=schema.index_values(case_submission.submitter_data),
+        documents=case_submission.documents,
+        workflow_history=[{
+            "action": "submitted",
+            "timestamp": datetime.utcnow(),
+            "comment": "Case submitted from front-office"
+        }],
+        history_count=1,
+        search_terms=case_search_terms(case_number, case_submission.submitter_data, case_submission.case_type),
+    )
+
 @app.post("/api/cases/submit")
 async def submit_case(case_submission: CaseSubmission):
     """Endpoint for front-office to submit cases"""
+    # Rejected before a case number is reserved
+    errors = validate_submitter_data(case_submission)
+    if errors:
+        raise HTTPException(status_code=422, detail=[{**error, "loc": ["body", *error["loc"]]} for error in errors])
     try:
-        case = Case(
-            case_type=case_submission.case_type,
-            case_number=generate_case_number(case_submission.case_type),
-            submitter_data=case_submission.submitter_data,
-            documents=case_submission.documents,
-            workflow_history=[{
-                "action": "submitted",
-                "timestamp": datetime.utcnow(),
-                "comment": "Case submitted from front-office"
-            }]
-        )
+        case = build_case(case_submission, await generate_case_number(case_submission.case_type))
         
-        case_dict = case.dict()
-        db.cases.insert_one(case_dict)
+        case_dict = case_document(case)
+        await db.cases.insert_one(case_dict)
+        await increment_stats({f"by_status.{case.status}": 1, f"by_type.{case.case_type}": 1})
+        publish_case_event(case_dict)
+        # History is recorded by the case_submitted job, off the request path. The case is
+        # saved either way: a job that could not be queued now is queued by the sweeper.
+        job_id = None
+        try:
+            job_id = await enqueue_job("case_submitted", case.id)
+        except Exception as e:
+            logger.error(f"Could not queue processing for case {case.case_number}: {str(e)}")
         
         logger.info(f"New case submitted: {case.case_number}")
-        return {"success": True, "case_id": case.id, "case_number": case.case_number}
+        return {"success": True, "case_id": case.id, "case_number": case.case_number, "job_id": job_id}
     except Exception as e:
         logger.error(f"Error submitting case: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/cases")
-async def get_cases(current_user: dict = Depends(get_current_user)):
-    """Get cases based on user role and assignments"""
-    filter_query = {}
-    
-    # Role-based filtering
+# Bulk submission
+BULK_SUBMIT_CHUNK_SIZE = int(os.environ.get('BULK_SUBMIT_CHUNK_SIZE', '1000'))
+
+async def iter_bulk_items(request: Request):
+    """Yield (index, raw item) from a JSON array body or an NDJSON stream"""
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for index, item in enumerate(items):
+        yield index, item
+
+async def insert_case_chunk(chunk: List[tuple], results: List[dict]):
+    """Number and insert one chunk of validated (index, CaseSubmission) pairs"""
+    year = datetime.utcnow().year
+    by_type: Dict[str, List[tuple]] = {}
+    for index, case_submission in chunk:
+        by_type.setdefault(case_submission.case_type, []).append((index, case_submission))
+
+    cases = []
+    for case_type, items in by_type.items():
+        # One counter round trip per case type reserves the whole range
+        first = await reserve_case_sequence(case_type, year, len(items))
+        for offset, (index, case_submission) in enumerate(items):
+            cases.append((index, build_case(case_submission, format_case_number(case_type, year, first + offset))))
+
+    failed = {}
+    try:
+        await db.cases.insert_many([case_document(case) for _, case in cases], ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed[error["index"]] = error.get("errmsg", "Insert failed")
+
+    increments: Dict[str, int] = {}
+    inserted = []
+    for position, (index, case) in enumerate(cases):
+        if position in failed:
+            results.append({"index": index, "success": False, "error": failed[position]})
+        else:
+            results.append({"index": index, "success": True, "case_id": case.id, "case_number": case.case_number})
+            for key in (f"by_status.{case.status}", f"by_type.{case.case_type}"):
+                increments[key] = increments.get(key, 0) + 1
+            inserted.append(case.id)
+            publish_case_event(case.model_dump())
+    await increment_stats(increments)
+    # Same case_submitted jobs as single submissions, queued with one insert
+    try:
+        await enqueue_jobs("case_submitted", inserted)
+    except Exception as e:
+        logger.error(f"Could not queue processing for {len(inserted)} bulk-submitted cases: {str(e)}")
+
+@app.post("/api/cases/submit/bulk")
+async def submit_cases_bulk(request: Request):
+    """Endpoint for front-office batch imports, accepts a JSON array or NDJSON of case submissions"""
+    results = []
+    chunk = []
+    async for index, raw in iter_bulk_items(request):
+        try:
+            item = json.loads(raw) if isinstance(raw, bytes) else raw
+            if not isinstance(item, dict):
+                raise ValueError("Item must be a JSON object")
+            case_submission = CaseSubmission(**item)
+            errors = validate_submitter_data(case_submission)
+            if errors:
+                results.append({"index": index, "success": False, "error": errors})
+            else:
+                chunk.append((index, case_submission))
+        except ValidationError as e:
+            results.append({"index": index, "success": False, "error": json.loads(e.json())})
+        except ValueError as e:
+            results.append({"index": index, "success": False, "error": str(e)})
+        if len(chunk) >= BULK_SUBMIT_CHUNK_SIZE:
+            await insert_case_chunk(chunk, results)
+            chunk = []
+    if chunk:
+        await insert_case_chunk(chunk, results)
+
+    results.sort(key=lambda result: result["index"])
+    inserted = sum(1 for result in results if result["success"])
+    logger.info(f"Bulk submission: {inserted} cases inserted, {len(results) - inserted} failed")
+    return {
+        "success": inserted == len(results),
+        "inserted": inserted,
+        "failed": len(results) - inserted,
+        "results": results,
+    }
+
+# Conditional requests
+# Case detail, case list pages and the user list carry weak ETags computed from what
+# the body is built from (ids and updated_at), so If-None-Match can be answered with
+# a 304 before anything is serialized. Browsers revalidate on every fetch.
+CACHE_CONTROL = "private, no-cache"
+# Migrations rewrite cases without touching updated_at, which also drives archival. Any
+# migration that changes how stored cases render must bump this, so old ETags stop matching.
+CASE_ETAG_VERSION = 2  # 2: applicant_name and index_fields backfilled
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.blake2b(orjson.dumps(parts, default=json_default), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against the request's If-None-Match"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+# Case listing helpers
+CASE_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "case_type": 1,
+    "case_number": 1,
+    "status": 1,
+    "assigned_to": 1,
+    "assigned_team": 1,
+    "applicant_name": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+# Kept on the stored case for queries and background work, never returned by the API
+CASE_STORAGE_FIELDS = ("search_terms", "index_fields", "processing_pending", "workflow_op_id")
+CASE_FULL_PROJECTION = {"_id": 0, **{field: 0 for field in CASE_STORAGE_FIELDS}}
+
+def encode_cursor(timestamp: datetime, item_id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, case_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), case_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def case_summary(case: dict) -> dict:
+    return {key: case.get(key) for key in CASE_SUMMARY_PROJECTION if key != "_id"}
+
+def case_visible_to(current_user: dict, case: dict) -> bool:
+    """In-memory counterpart of case_visibility_filter"""
     if current_user["role"] in ["registrar_assistant", "lawyer", "notary", "bailiff"]:
-        filter_query["$or"] = [
+        return case.get("assigned_to") == current_user["id"] or case.get("status") == "submitted"
+    return True
+
+def case_visibility_filter(current_user: dict) -> dict:
+    """Role-based filtering shared by every case listing"""
+    if current_user["role"] in ["registrar_assistant", "lawyer", "notary", "bailiff"]:
+        return {"$or": [
             {"assigned_to": current_user["id"]},
             {"status": "submitted"}  # Unassigned cases
-        ]
-    elif current_user["role"] == "registrar":
-        # Registrars can see all cases
-        pass
-    elif current_user["role"] == "supervisor":
-        # Supervisors can see all cases
-        pass
-    
-    cases = list(db.cases.find(filter_query).sort("created_at", -1))
+        ]}
+    # Registrars and supervisors can see all cases
+    return {}
+
+@app.get("/api/cases", response_model=CasePage)
+async def get_cases(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    case_type: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    applicant_name: Optional[str] = None,
+    parcel_id: Optional[str] = None,
+    business_name: Optional[str] = None,
+    contact_email: Optional[str] = None,
+    view: Literal["summary", "full"] = "summary",
+    include_archived: bool = False,
+    current_user: dict = Depends(get_current_user),
+):
+    """Get one page of cases based on user role and assignments, newest first"""
+    clauses = []
+    visibility = case_visibility_filter(current_user)
+    if visibility:
+        clauses.append(visibility)
+    if status:
+        clauses.append({"status": status})
+    if case_type:
+        clauses.append({"case_type": case_type})
+    if assigned_to:
+        clauses.append({"assigned_to": assigned_to})
+    # Exact matches on the normalized keys extracted by the case type schemas
+    for key, value in (("applicant_name", applicant_name), ("parcel_id", parcel_id),
+                       ("business_name", business_name), ("contact_email", contact_email)):
+        if value:
+            clauses.append({f"index_fields.{key}": normalize_key(value)})
+    if cursor:
+        # Keyset pagination on (created_at, id) so deep pages cost the same as the first
+        created_at, case_id = decode_cursor(cursor)
+        clauses.append({"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": case_id}},
+        ]})
+    filter_query = {"$and": clauses} if clauses else {}
+    projection = CASE_SUMMARY_PROJECTION if view == "summary" else CASE_FULL_PROJECTION
+
+    # Fetch one extra document to know whether another page exists
+    sort = [("created_at", -1), ("id", -1)]
+    cases = await db.cases.find(filter_query, projection).sort(sort).limit(limit + 1).to_list(length=None)
+    if include_archived:
+        # Both collections share the keyset order, so one page of each merges into the page
+        archived = await db.cases_archive.find(filter_query, projection).sort(sort).limit(limit + 1).to_list(length=None)
+        cases = list(heapq.merge(cases, archived, key=lambda case: (case["created_at"], case["id"]), reverse=True))
+    page = cases[:limit]
+    next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["id"]) if len(cases) > limit else None
+
+    # The page is read before responding so its validator can go in the headers
+    etag = weak_etag(CASE_ETAG_VERSION, view, next_cursor, [(case["id"], case.get("updated_at"), case.get("archived_at")) for case in page])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    def stream_page():
+        yield b'{"items":['
+        for index, case in enumerate(page):
+            yield (b"," if index else b"") + orjson.dumps(case, default=json_default)
+        yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b'}'
+
+    return StreamingResponse(stream_page(), media_type="application/json", headers=cache_headers(etag))
+
+@app.get("/api/cases/search")
+async def search_cases(
+    q: str = Query(..., min_length=1),
+    status: Optional[str] = None,
+    case_type: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+):
+    """Search cases by case number and submitter details, with facet counts for the matches"""
+    terms = query_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no searchable terms")
     
-    # Convert ObjectId to string and format dates
-    for case in cases:
-        case["_id"] = str(case["_id"])
-        case["created_at"] = case["created_at"].isoformat()
-        case["updated_at"] = case["updated_at"].isoformat()
+    clauses = [{"search_terms": {"$all": terms}}]
+    visibility = case_visibility_filter(current_user)
+    if visibility:
+        clauses.append(visibility)
+    if status:
+        clauses.append({"status": status})
+    if case_type:
+        clauses.append({"case_type": case_type})
+    if assigned_to:
+        clauses.append({"assigned_to": assigned_to})
     
-    return cases
+    pipeline = [
+        {"$match": {"$and": clauses}},
+        {"$facet": {
+            "items": [
+                {"$sort": {"created_at": -1, "id": -1}},
+                {"$limit": limit},
+                {"$project": CASE_SUMMARY_PROJECTION},
+            ],
+            "total": [{"$count": "count"}],
+            "status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "case_type": [{"$group": {"_id": "$case_type", "count": {"$sum": 1}}}],
+            "assigned_to": [
+                {"$match": {"assigned_to": {"$ne": None}}},
+                {"$group": {"_id": "$assigned_to", "count": {"$sum": 1}}},
+            ],
+        }},
+    ]
+    result = (await db.cases.aggregate(pipeline).to_list(length=None))[0]
+    return FastJSONResponse({
+        "items": result["items"],
+        "total": result["total"][0]["count"] if result["total"] else 0,
+        "facets": {
+            facet: {item["_id"]: item["count"] for item in result[facet]}
+            for facet in ("status", "case_type", "assigned_to")
+        },
+    })
 
-@app.get("/api/cases/{case_id}")
-async def get_case(case_id: str, current_user: dict = Depends(get_current_user)):
-    """Get specific case details"""
-    case = db.cases.find_one({"id": case_id})
-    if not case:
-        raise HTTPException(status_code=404, detail="Case not found")
-    
-    # Check access permissions
+@app.get("/api/cases/events")
+async def case_event_stream(request: Request, current_user: dict = Depends(get_current_user)):
+    """Server-sent events with created/updated/removed case summaries visible to the user"""
+    subscriber = case_events.subscribe(current_user)
+
+    async def stream_events():
+        try:
+            yield "event: ready\ndata: {}\n\n"
+            while not subscriber.overflowed:
+                try:
+                    event, data = await asyncio.wait_for(subscriber.queue.get(), CASE_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data, default=json_default)}\n\n"
+            if subscriber.overflowed:
+                yield "event: resync\ndata: {}\n\n"
+        finally:
+            case_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def check_case_access(case: dict, current_user: dict):
     can_access = (
         current_user["role"] in ["registrar", "supervisor"] or
         case.get("assigned_to") == current_user["id"] or
@@ -231,97 +1553,635 @@ async def get_case(case_id: str, current_user: dict = Depends(get_current_user))
     
     if not can_access:
         raise HTTPException(status_code=403, detail="Access denied")
+
+@app.get("/api/cases/{case_id}", response_model=CaseDetail)
+async def get_case(case_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """Get specific case details by id or case number, including archived cases"""
+    case = await find_case(case_id, CASE_FULL_PROJECTION)
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
     
-    case["_id"] = str(case["_id"])
-    case["created_at"] = case["created_at"].isoformat()
-    case["updated_at"] = case["updated_at"].isoformat()
+    check_case_access(case, current_user)
     
-    return case
+    # Every case write sets updated_at, so it versions the document
+    etag = weak_etag(CASE_ETAG_VERSION, case["id"], case.get("updated_at"), case.get("archived_at"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    # Returned directly so the document skips jsonable_encoder; the model documents the shape
+    return FastJSONResponse(case, headers=cache_headers(etag))
 
-@app.post("/api/cases/{case_id}/workflow")
-async def update_case_workflow(case_id: str, workflow_action: WorkflowAction, current_user: dict = Depends(get_current_user)):
-    """Update case workflow"""
-    case = db.cases.find_one({"id": case_id})
+@app.get("/api/cases/{case_id}/history")
+async def get_case_history(
+    case_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """Get one page of a case's workflow events, newest first"""
+    case = await find_case(case_id, {"id": 1, "status": 1, "assigned_to": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    check_case_access(case, current_user)
+    
+    filter_query: Dict[str, Any] = {"case_id": case["id"]}
+    if cursor:
+        timestamp, event_id = decode_cursor(cursor)
+        filter_query["$or"] = [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "id": {"$lt": event_id}},
+        ]
+    events = await db.workflow_events.find(filter_query, {"_id": 0}).sort(
+        [("timestamp", -1), ("id", -1)]
+    ).limit(limit + 1).to_list(length=None)
+    
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(events[-1]["timestamp"], events[-1]["id"])
+    return FastJSONResponse({"items": events, "next_cursor": next_cursor})
+
+# Case documents
+# Attachments live in a local content-addressed store: the SHA-256 computed while the
+# upload streams in is both the file name and the document id, so identical files are
+# stored once. Metadata is kept in db.documents and case.documents holds the ids.
+DOCUMENT_STORAGE_DIR = os.environ.get('DOCUMENT_STORAGE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads'))
+MAX_DOCUMENT_SIZE = int(os.environ.get('MAX_DOCUMENT_SIZE', str(50 * 1024 * 1024)))
+DOCUMENT_CHUNK_SIZE = 64 * 1024
+
+def document_path(document_id: str) -> str:
+    return os.path.join(DOCUMENT_STORAGE_DIR, document_id[:2], document_id[2:4], document_id)
+
+async def store_document_stream(chunks):
+    """Write a byte stream to the store chunk by chunk; returns (document_id, size, created)"""
+    loop = asyncio.get_running_loop()
+    temp_dir = os.path.join(DOCUMENT_STORAGE_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > MAX_DOCUMENT_SIZE:
+                    raise HTTPException(status_code=413, detail="Document too large")
+                digest.update(chunk)
+                await loop.run_in_executor(None, fh.write, chunk)
+        document_id = digest.hexdigest()
+        final_path = document_path(document_id)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+            return document_id, size, False
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_path, final_path)
+        return document_id, size, True
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+async def read_document_range(path: str, start: int, end: int):
+    loop = asyncio.get_running_loop()
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await loop.run_in_executor(None, fh.read, min(DOCUMENT_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def parse_range_header(range_header: str, size: int):
+    """Parse a single `bytes=` range into (start, end); None means ignore it and send everything.
+    Raises 416 when the range cannot be satisfied."""
+    units, _, spec = range_header.partition("=")
+    if units.strip().lower() != "bytes" or "," in spec or "-" not in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(0, size - int(last))
+            end = size - 1
+    except ValueError:
+        return None
+    if first and last and end < start:
+        return None  # Syntactically invalid (RFC 7233), so the range is ignored rather than refused
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+def content_disposition(filename: str) -> str:
+    """Attachment header with an ASCII fallback name and the UTF-8 name (RFC 6266/5987)"""
+    filename = re.sub(r'[\x00-\x1f\x7f"\\]', "", filename)
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+@app.post("/api/cases/{case_id}/documents")
+async def upload_case_document(
+    case_id: str,
+    request: Request,
+    filename: str = Query(..., min_length=1),
+    current_user: dict = Depends(get_current_user),
+):
+    """Stream the raw request body into the document store and attach it to the case"""
+    case = await db.cases.find_one({"id": case_id}, {"status": 1, "assigned_to": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    check_case_access(case, current_user)
+    
+    document_id, size, created = await store_document_stream(request.stream())
+    now = datetime.utcnow()
+    await db.documents.update_one(
+        {"id": document_id},
+        {"$setOnInsert": {
+            "id": document_id,
+            "filename": filename,
+            "content_type": request.headers.get("content-type", "application/octet-stream"),
+            "size": size,
+            "uploaded_by": current_user["id"],
+            "created_at": now,
+        }},
+        upsert=True,
+    )
+    await db.cases.update_one({"id": case_id}, {"$addToSet": {"documents": document_id}, "$set": {"updated_at": now}})
+    
+    logger.info(f"Document {document_id} attached to case {case_id} ({size} bytes)")
+    return {"success": True, "document_id": document_id, "size": size, "deduplicated": not created}
+
+@app.get("/api/cases/{case_id}/documents/{document_id}")
+async def download_case_document(case_id: str, document_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """Download a case attachment, honouring single HTTP byte ranges"""
+    case = await find_case(case_id, {"status": 1, "assigned_to": 1, "documents": 1})
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
+    check_case_access(case, current_user)
     
-    # Prepare workflow history entry
-    workflow_entry = {
+    document = await db.documents.find_one({"id": document_id}) if document_id in case.get("documents", []) else None
+    path = document_path(document_id)
+    if not document or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    size = document["size"]
+    start, end = 0, size - 1
+    status_code = 200
+    range_header = request.headers.get("range")
+    if range_header and size:
+        requested = parse_range_header(range_header, size)
+        if requested:
+            start, end = requested
+            status_code = 206
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1 if size else 0),
+        "Content-Disposition": content_disposition(document["filename"]),
+        "ETag": f'"{document_id}"',
+    }
+    if status_code == 206:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        read_document_range(path, start, end),
+        status_code=status_code,
+        media_type=document["content_type"],
+        headers=headers,
+    )
+
+# Workflow transitions: action -> (statuses it can be applied from, resulting status)
+WORKFLOW_TRANSITIONS = {
+    "assign": (["submitted", "assigned", "under_review", "pending_documents"], "assigned"),
+    "review": (["assigned", "pending_documents"], "under_review"),
+    "approve": (["under_review"], "approved"),
+    "reject": (["under_review"], "rejected"),
+    "request_documents": (["under_review"], "pending_documents"),
+}
+
+def workflow_status_filter(workflow_action: WorkflowAction) -> dict:
+    """Status condition a case must satisfy for the transition to apply"""
+    if workflow_action.action not in WORKFLOW_TRANSITIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown workflow action: {workflow_action.action}")
+    if workflow_action.action == "assign" and not workflow_action.assigned_to:
+        raise HTTPException(status_code=400, detail="assigned_to is required to assign a case")
+    allowed, _ = WORKFLOW_TRANSITIONS[workflow_action.action]
+    if workflow_action.expected_status:
+        if workflow_action.expected_status not in allowed:
+            raise HTTPException(status_code=409, detail=f"Cannot {workflow_action.action} a case that is {workflow_action.expected_status}")
+        return {"status": workflow_action.expected_status}
+    return {"status": {"$in": allowed}}
+
+async def check_assignee(workflow_action: WorkflowAction):
+    """Only active users can be assigned. assigned_to also becomes a key in the dashboard stats."""
+    if workflow_action.action != "assign":
+        return
+    if not await db.users.find_one({"id": workflow_action.assigned_to, "is_active": True}, {"_id": 1}):
+        raise HTTPException(status_code=400, detail="assigned_to must be an active user")
+
+def workflow_entry(workflow_action: WorkflowAction, current_user: dict) -> dict:
+    return {
         "action": workflow_action.action,
         "timestamp": datetime.utcnow(),
         "performed_by": current_user["id"],
         "performed_by_name": current_user["full_name"],
         "comment": workflow_action.comment
     }
-    
-    # Update case based on action
+
+def workflow_update(workflow_action: WorkflowAction, entry: dict) -> dict:
+    """Single update document setting the new state and appending the history entry"""
     update_data = {
-        "updated_at": datetime.utcnow(),
+        "status": WORKFLOW_TRANSITIONS[workflow_action.action][1],
+        "updated_at": entry["timestamp"],
     }
-    
     if workflow_action.action == "assign":
         update_data["assigned_to"] = workflow_action.assigned_to
-        update_data["status"] = "assigned"
-    elif workflow_action.action == "review":
-        update_data["status"] = "under_review"
-    elif workflow_action.action == "approve":
-        update_data["status"] = "approved"
-    elif workflow_action.action == "reject":
-        update_data["status"] = "rejected"
-    elif workflow_action.action == "request_documents":
-        update_data["status"] = "pending_documents"
+        if workflow_action.assigned_team:
+            update_data["assigned_team"] = workflow_action.assigned_team
+    
+    return {
+        "$set": update_data,
+        "$push": {"workflow_history": {"$each": [entry], "$slice": -WORKFLOW_HISTORY_INLINE_LIMIT}},
+        "$inc": {"history_count": 1},
+    }
+
+def apply_workflow_update(before: dict, update: dict) -> dict:
+    """The case as it reads after `update`, computed from its previous state"""
+    history = before.get("workflow_history", []) + update["$push"]["workflow_history"]["$each"]
+    case = {
+        **before,
+        **update["$set"],
+        "workflow_history": history[-WORKFLOW_HISTORY_INLINE_LIMIT:],
+        "history_count": before.get("history_count", 0) + 1,
+    }
+    case.pop("_id", None)
+    for field in CASE_STORAGE_FIELDS:
+        case.pop(field, None)
+    return case
+
+@app.post("/api/cases/{case_id}/workflow")
+async def update_case_workflow(case_id: str, workflow_action: WorkflowAction, current_user: dict = Depends(get_current_user)):
+    """Apply a workflow transition in one round trip and return the updated case"""
+    filter_query = {"id": case_id, **workflow_status_filter(workflow_action)}
+    await check_assignee(workflow_action)
+    entry = workflow_entry(workflow_action, current_user)
+    update = workflow_update(workflow_action, entry)
+    # The previous state is needed for the stats delta; the new one is derived from the update
+    before = await db.cases.find_one_and_update(filter_query, update, return_document=ReturnDocument.BEFORE)
+    if not before:
+        # Only the failure path pays for a second read, to tell missing from conflicting
+        current = await db.cases.find_one({"id": case_id}, {"status": 1})
+        if not current:
+            raise HTTPException(status_code=404, detail="Case not found")
+        raise HTTPException(status_code=409, detail=f"Cannot {workflow_action.action} a case that is {current['status']}")
     
-    # Use two separate operations: one for the update and one for the push
-    db.cases.update_one({"id": case_id}, {"$set": update_data})
-    db.cases.update_one({"id": case_id}, {"$push": {"workflow_history": workflow_entry}})
+    case = apply_workflow_update(before, update)
+    await record_workflow_events([workflow_event(case_id, entry)])
+    await increment_stats(transition_stats_delta(before, case))
+    publish_case_event(case, before)
     
-    return {"success": True, "message": f"Case {workflow_action.action} successfully"}
+    return {"success": True, "message": f"Case {workflow_action.action} successfully", "case": case}
 
-@app.get("/api/users")
-async def get_users(current_user: dict = Depends(get_current_user)):
-    """Get users for assignment"""
+# Bulk workflow actions
+# One action applied to many cases: each chunk is read with one query, checked case by
+# case against the transition table, and written with a single unordered bulk_write whose
+# filters repeat the status condition, so a case changed in between is left untouched.
+
+async def apply_workflow_chunk(case_ids: List[str], workflow_action: WorkflowAction, status_filter: dict,
+                               current_user: dict) -> Dict[str, dict]:
+    """Apply the action to one chunk of cases and return a result per case id"""
+    allowed = status_filter["status"]["$in"] if isinstance(status_filter["status"], dict) else [status_filter["status"]]
+    entry = workflow_entry(workflow_action, current_user)
+    update = workflow_update(workflow_action, entry)
+    # Marks the cases this write changed, in case the write did not change them all
+    op_id = str(uuid.uuid4())
+    update["$set"]["workflow_op_id"] = op_id
+    results: Dict[str, dict] = {}
+    candidates: Dict[str, dict] = {}
+    async for before in db.cases.find({"id": {"$in": case_ids}}, {field: 0 for field in CASE_STORAGE_FIELDS}):
+        if before["status"] in allowed:
+            candidates[before["id"]] = before
+        else:
+            results[before["id"]] = {"case_id": before["id"], "success": False, "error": f"Cannot {workflow_action.action} a case that is {before['status']}"}
+    for case_id in case_ids:
+        if case_id not in results and case_id not in candidates:
+            results[case_id] = {"case_id": case_id, "success": False, "error": "Case not found"}
+    if not candidates:
+        return results
+
+    operations = [UpdateOne({"id": case_id, **status_filter}, update) for case_id in candidates]
+    outcome = await db.cases.bulk_write(operations, ordered=False)
+    applied = set(candidates)
+    if outcome.modified_count != len(candidates):
+        # Only the failure path pays for a second read
+        applied = {case["id"] async for case in db.cases.find(
+            {"id": {"$in": list(candidates)}, "workflow_op_id": op_id}, {"id": 1}
+        )}
+
+    increments: Dict[str, int] = {}
+    events = []
+    for case_id, before in candidates.items():
+        if case_id not in applied:
+            results[case_id] = {"case_id": case_id, "success": False, "error": "Case was changed by another request"}
+            continue
+        case = apply_workflow_update(before, update)
+        for key, value in transition_stats_delta(before, case).items():
+            increments[key] = increments.get(key, 0) + value
+        events.append(workflow_event(case_id, entry))
+        publish_case_event(case, before)
+        results[case_id] = {"case_id": case_id, "success": True, "status": case["status"]}
+    await record_workflow_events(events)
+    await increment_stats(increments)
+    return results
+
+@app.post("/api/cases/workflow/bulk")
+async def update_cases_workflow_bulk(bulk_action: BulkWorkflowAction, current_user: dict = Depends(get_current_user)):
+    """Apply one workflow action to many cases, reporting success or failure per case"""
     if current_user["role"] not in ["registrar", "supervisor"]:
         raise HTTPException(status_code=403, detail="Access denied")
+    case_ids = list(dict.fromkeys(bulk_action.case_ids))
+    if len(case_ids) > settings.BULK_WORKFLOW_MAX_CASES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BULK_WORKFLOW_MAX_CASES} cases per request")
+    workflow_action = WorkflowAction(**bulk_action.model_dump(exclude={"case_ids"}))
+    status_filter = workflow_status_filter(workflow_action)
+    await check_assignee(workflow_action)
+
+    results: Dict[str, dict] = {}
+    for start in range(0, len(case_ids), settings.BULK_WORKFLOW_CHUNK_SIZE):
+        chunk = case_ids[start:start + settings.BULK_WORKFLOW_CHUNK_SIZE]
+        results.update(await apply_workflow_chunk(chunk, workflow_action, status_filter, current_user))
+
+    ordered = [results[case_id] for case_id in case_ids]
+    updated = sum(1 for result in ordered if result["success"])
+    logger.info(f"Bulk {workflow_action.action}: {updated} cases updated, {len(ordered) - updated} failed")
+    return {
+        "success": updated == len(ordered),
+        "updated": updated,
+        "failed": len(ordered) - updated,
+        "results": ordered,
+    }
+
+# Work queue
+# Staff pull the oldest unassigned case with POST /api/queue/next. The claim is a single
+# find_one_and_update on {status: submitted, assigned_to: None}, so concurrent callers
+# each get a different case and nobody has to pick from the shared submitted pool.
+# Registrars can also push waiting cases to a role/team with POST /api/queue/dispatch.
+QUEUE_ROLES = ["registrar_assistant", "lawyer", "notary", "bailiff", "registrar"]
+OPEN_STATUSES = ["assigned", "under_review", "pending_documents"]
+
+def queue_filter(case_type: Optional[str] = None) -> dict:
+    filter_query: Dict[str, Any] = {"status": "submitted", "assigned_to": None}
+    if case_type:
+        filter_query["case_type"] = case_type
+    return filter_query
+
+async def claim_next_case(assignee: dict, current_user: dict, case_type: Optional[str], comment: str) -> Optional[dict]:
+    """Atomically assign the oldest waiting case to `assignee`, or return None if the queue is empty"""
+    workflow_action = WorkflowAction(
+        action="assign", assigned_to=assignee["id"], assigned_team=assignee.get("team"), comment=comment
+    )
+    entry = workflow_entry(workflow_action, current_user)
+    update = workflow_update(workflow_action, entry)
+    before = await db.cases.find_one_and_update(
+        queue_filter(case_type), update, sort=[("created_at", 1), ("id", 1)], return_document=ReturnDocument.BEFORE
+    )
+    if not before:
+        return None
     
-    users = list(db.users.find({"is_active": True}, {"password": 0}))
-    for user in users:
-        user["_id"] = str(user["_id"])
-        user["created_at"] = user["created_at"].isoformat()
-    
-    return users
+    case = apply_workflow_update(before, update)
+    await record_workflow_events([workflow_event(case["id"], entry)])
+    await increment_stats(transition_stats_delta(before, case))
+    publish_case_event(case, before)
+    return case
 
-@app.get("/api/dashboard/stats")
-async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
-    """Get dashboard statistics"""
-    stats = {}
+async def pick_assignees(staff: List[dict], strategy: str, rotation_key: str, count: int) -> List[dict]:
+    """Choose an assignee for each of the next `count` cases"""
+    if strategy == "round_robin":
+        # The rotation position is shared, so concurrent dispatches continue where the last one stopped
+        state = await db.queue_state.find_one_and_update(
+            {"_id": rotation_key}, {"$inc": {"position": count}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        start = state["position"] - count
+        return [staff[(start + offset) % len(staff)] for offset in range(count)]
     
-    # Total cases by status
     pipeline = [
-        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        {"$match": {"assigned_to": {"$in": [member["id"] for member in staff]}, "status": {"$in": OPEN_STATUSES}}},
+        {"$group": {"_id": "$assigned_to", "count": {"$sum": 1}}},
     ]
-    status_counts = list(db.cases.aggregate(pipeline))
-    stats["by_status"] = {item["_id"]: item["count"] for item in status_counts}
+    load = {member["id"]: 0 for member in staff}
+    async for item in db.cases.aggregate(pipeline):
+        load[item["_id"]] = item["count"]
+    assignees = []
+    for _ in range(count):
+        member = min(staff, key=lambda member: (load[member["id"]], member["id"]))
+        load[member["id"]] += 1
+        assignees.append(member)
+    return assignees
+
+@app.post("/api/queue/next")
+async def claim_from_queue(claim: Optional[QueueClaim] = None, current_user: dict = Depends(get_current_user)):
+    """Assign the oldest waiting case to the current user"""
+    if current_user["role"] not in QUEUE_ROLES:
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    # Cases by type
-    pipeline = [
-        {"$group": {"_id": "$case_type", "count": {"$sum": 1}}}
-    ]
-    type_counts = list(db.cases.aggregate(pipeline))
-    stats["by_type"] = {item["_id"]: item["count"] for item in type_counts}
+    case_type = claim.case_type if claim else None
+    case = await claim_next_case(current_user, current_user, case_type, "Claimed from the work queue")
+    return {"success": True, "case": case}
+
+@app.post("/api/queue/dispatch")
+async def dispatch_queue(dispatch: QueueDispatch, current_user: dict = Depends(get_current_user)):
+    """Assign waiting cases across the active staff of a role/team"""
+    if current_user["role"] not in ["registrar", "supervisor"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if dispatch.role not in QUEUE_ROLES:
+        raise HTTPException(status_code=400, detail=f"Cases cannot be dispatched to role {dispatch.role}")
+    
+    staff_filter: Dict[str, Any] = {"role": dispatch.role, "is_active": True}
+    if dispatch.team:
+        staff_filter["team"] = dispatch.team
+    staff = await db.users.find(staff_filter, {"_id": 0, "password": 0}).sort("id", 1).to_list(length=None)
+    if not staff:
+        raise HTTPException(status_code=400, detail="No active staff to dispatch to")
+    
+    waiting = await db.cases.count_documents(queue_filter(dispatch.case_type), limit=dispatch.limit)
+    if not waiting:
+        return {"success": True, "assigned": []}
+    rotation_key = f"{dispatch.role}:{dispatch.team or '*'}"
+    assignees = await pick_assignees(staff, dispatch.strategy, rotation_key, waiting)
+    
+    assigned = []
+    for assignee in assignees:
+        case = await claim_next_case(assignee, current_user, dispatch.case_type, f"Dispatched ({dispatch.strategy})")
+        if case is None:
+            break  # Claimed by someone else in the meantime
+        assigned.append({"case_id": case["id"], "case_number": case["case_number"], "assigned_to": assignee["id"]})
+    return {"success": True, "assigned": assigned}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Status of a background job"""
+    job = await db.jobs.find_one({"id": job_id}, {"_id": 0, "idempotency_key": 0, "locked_by": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/api/cases/{case_id}/jobs")
+async def get_case_jobs(case_id: str, current_user: dict = Depends(get_current_user)):
+    """Background jobs queued for a case, newest first"""
+    case = await find_case(case_id, {"id": 1, "status": 1, "assigned_to": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    check_case_access(case, current_user)
+    
+    jobs = await db.jobs.find(
+        {"case_id": case["id"]}, {"_id": 0, "idempotency_key": 0, "locked_by": 0}
+    ).sort("created_at", DESCENDING).to_list(length=None)
+    return {"items": jobs}
+
+@app.get("/api/users", response_model=List[User])
+async def get_users(request: Request, current_user: dict = Depends(get_current_user)):
+    """Get users for assignment"""
+    if current_user["role"] not in ["registrar", "supervisor"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    cached = user_list_cache.get("active")
+    if cached is None:
+        users = await db.users.find({"is_active": True}, {"_id": 0, "password": 0}).sort("username", 1).to_list(length=None)
+        body = FastJSONResponse(users).body
+        cached = (weak_etag(body), body)
+        user_list_cache.set("active", cached)
+    etag, body = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
+
+@app.patch("/api/users/{user_id}")
+async def update_user(user_id: str, user_update: UserUpdate, current_user: dict = Depends(get_current_user)):
+    """Change a user's role, team or activation"""
+    if current_user["role"] != "supervisor":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    update_data = {k: v for k, v in user_update.model_dump().items() if v is not None}
+    if not update_data:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    
+    user = await db.users.find_one_and_update(
+        {"id": user_id},
+        {"$set": update_data},
+        projection={"_id": 0, "password": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user_cache.invalidate(user["username"])
+    user_list_cache.invalidate()
+    return user
+
+user_cache_lookups = metrics.registry.register(metrics.Counter(
+    "user_cache_lookups_total", "Authenticated user cache lookups by result", ("result",),
+))
+user_cache_size = metrics.registry.register(metrics.Gauge(
+    "user_cache_entries", "Users currently held in the authenticated user cache",
+))
+
+def collect_user_cache_metrics():
+    user_cache_lookups.set("hit", value=user_cache.hits)
+    user_cache_lookups.set("miss", value=user_cache.misses)
+    user_cache_size.set(value=len(user_cache.entries))
+
+metrics.registry.add_collector(collect_user_cache_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/health")
+async def liveness():
+    """The process is up and serving requests"""
+    return {"status": "ok"}
+
+@app.get("/api/health/ready")
+async def readiness():
+    """Ready once MongoDB answers a ping through this worker's pool"""
+    pool = {**pool_listener.snapshot(), "max_size": settings.MONGO_MAX_POOL_SIZE}
+    try:
+        await asyncio.wait_for(db.command("ping"), settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    except Exception as e:
+        return FastJSONResponse({"status": "unavailable", "detail": str(e) or type(e).__name__, "pool": pool}, status_code=503)
+    return {"status": "ready", "pool": pool}
+
+@app.get("/api/monitoring/user-cache")
+async def get_user_cache_stats(current_user: dict = Depends(get_current_user)):
+    """Hit/miss counters of the authenticated user cache"""
+    if current_user["role"] != "supervisor":
+        raise HTTPException(status_code=403, detail="Access denied")
+    return user_cache.stats()
+
+@app.get("/api/dashboard/stats")
+async def get_dashboard_stats(
+    source: Literal["materialized", "live"] = "materialized",
+    current_user: dict = Depends(get_current_user),
+):
+    """Get dashboard statistics, from the materialized stats document or computed live"""
+    if source == "live":
+        counts = await compute_live_stats()
+    else:
+        counts = await db.stats.find_one({"_id": STATS_DOC_ID})
+        if counts is None:
+            counts = await reconcile_stats()
+    
+    stats = {
+        "by_status": {key: value for key, value in counts.get("by_status", {}).items() if value},
+        "by_type": {key: value for key, value in counts.get("by_type", {}).items() if value},
+    }
     
     # My assigned cases
     if current_user["role"] not in ["supervisor"]:
-        my_cases = db.cases.count_documents({"assigned_to": current_user["id"]})
-        stats["my_assigned"] = my_cases
+        stats["my_assigned"] = counts.get("by_assignee", {}).get(current_user["id"], 0)
     
     return stats
 
 # Initialize on startup
+background_tasks: List[asyncio.Task] = []
+
 @app.on_event("startup")
 async def startup_event():
-    init_default_users()
+    connect_database()
+    await ensure_indexes()
+    await run_migration("seed_case_counters", seed_case_counters)
+    await run_migration("seed_generic_case_counter", seed_case_counters)
+    await run_migration("seed_dashboard_stats", reconcile_stats)
+    await run_migration("externalize_workflow_history", migrate_workflow_history)
+    # Re-run with the history_migrated marker for cases the first version skipped
+    await run_migration("externalize_workflow_history_marked", migrate_workflow_history)
+    await run_migration("backfill_search_terms", backfill_search_terms)
+    await run_migration("backfill_index_fields", backfill_index_fields)
+    if os.environ.get('QUERY_PLAN_GUARD') == '1':
+        await check_query_plans()
+    await init_default_users()
+    if STATS_RECONCILE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(stats_reconciler()))
+    if ARCHIVE_AFTER_DAYS > 0:
+        background_tasks.append(asyncio.create_task(case_archiver()))
+    if CASE_EVENTS_SOURCE == "change_stream":
+        background_tasks.append(asyncio.create_task(watch_case_changes()))
+    for index in range(settings.JOB_WORKERS):
+        background_tasks.append(asyncio.create_task(job_worker(job_worker_id(index))))
+    if settings.JOB_WORKERS > 0:
+        background_tasks.append(asyncio.create_task(pending_case_sweeper()))
     logger.info("Case Management System API started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    if client is not None:
+        client.close()
+    password_executor.shutdown(wait=False)
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # Multiple workers need an import string so each process loads its own app
+    uvicorn.run("server:app", host=settings.HOST, port=settings.PORT, workers=settings.WEB_CONCURRENCY)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Deployment settings, read once from the environment.
+
+Connection pools are per worker process: with WEB_CONCURRENCY workers the API
+can open up to WEB_CONCURRENCY * MONGO_MAX_POOL_SIZE connections to MongoDB,
+so size the two together against the server's connection limit.
+"""
+import os
+from typing import Optional
+
+# MongoDB connection
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+MONGO_DB_NAME = os.environ.get('MONGO_DB_NAME', 'case_management')
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '0'))  # 0 keeps idle connections
+# How long a request waits for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0'))  # 0 waits indefinitely
+
+# primary, primaryPreferred, secondary, secondaryPreferred or nearest. Reads from
+# secondaries may lag behind writes, which the workflow endpoints do not expect.
+MONGO_READ_PREFERENCE = os.environ.get('MONGO_READ_PREFERENCE', 'primary')
+# Unset values keep the server's default write concern
+MONGO_WRITE_CONCERN_W: Optional[str] = os.environ.get('MONGO_WRITE_CONCERN_W')  # e.g. 1 or majority
+MONGO_WRITE_CONCERN_JOURNAL: Optional[str] = os.environ.get('MONGO_WRITE_CONCERN_JOURNAL')  # true or false
+MONGO_WRITE_CONCERN_TIMEOUT_MS = int(os.environ.get('MONGO_WRITE_CONCERN_TIMEOUT_MS', '0'))
+
+# Readiness probe
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.environ.get('HEALTH_CHECK_TIMEOUT_SECONDS', '2'))
+
+# Seconds another worker may serve a stale active-user list (GET /api/users)
+USER_LIST_CACHE_TTL_SECONDS = float(os.environ.get('USER_LIST_CACHE_TTL_SECONDS', '60'))
+
+# Admission control and rate limiting (see ratelimit.py)
+# In-flight requests per worker before new ones are shed with 503; 0 disables the cap
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('MAX_CONCURRENT_REQUESTS', '256'))
+# off, memory (per worker) or mongo (shared by all workers, one round trip per request).
+# Anonymous requests are limited per source address: behind a reverse proxy every request
+# comes from the proxy, so set RATE_LIMIT_TRUST_FORWARDED_FOR before turning this on.
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'off')
+# Only enable behind a proxy that sets X-Forwarded-For; clients can forge it otherwise
+RATE_LIMIT_TRUST_FORWARDED_FOR = os.environ.get('RATE_LIMIT_TRUST_FORWARDED_FOR', 'false').lower() == 'true'
+# A *_PER_MINUTE of 0 leaves that rule's requests unlimited
+LOGIN_RATE_LIMIT_PER_MINUTE = float(os.environ.get('LOGIN_RATE_LIMIT_PER_MINUTE', '20'))
+LOGIN_RATE_LIMIT_BURST = int(os.environ.get('LOGIN_RATE_LIMIT_BURST', '10'))
+SUBMIT_RATE_LIMIT_PER_MINUTE = float(os.environ.get('SUBMIT_RATE_LIMIT_PER_MINUTE', '120'))
+SUBMIT_RATE_LIMIT_BURST = int(os.environ.get('SUBMIT_RATE_LIMIT_BURST', '30'))
+API_RATE_LIMIT_PER_MINUTE = float(os.environ.get('API_RATE_LIMIT_PER_MINUTE', '1200'))
+API_RATE_LIMIT_BURST = int(os.environ.get('API_RATE_LIMIT_BURST', '200'))
+
+# Background jobs (see the Background jobs section of server.py and worker.py)
+# Consumers started in every API process; 0 leaves the queue to `python worker.py`
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+JOB_RETRY_BASE_SECONDS = float(os.environ.get('JOB_RETRY_BASE_SECONDS', '2'))
+JOB_RETRY_MAX_SECONDS = float(os.environ.get('JOB_RETRY_MAX_SECONDS', '300'))
+# A running job whose worker goes quiet this long is handed to another worker
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', '60'))
+JOB_POLL_INTERVAL_SECONDS = float(os.environ.get('JOB_POLL_INTERVAL_SECONDS', '1'))
+# How often job consumers queue the jobs of cases saved without one (a crash right after the insert)
+JOB_SWEEP_INTERVAL_SECONDS = float(os.environ.get('JOB_SWEEP_INTERVAL_SECONDS', '60'))
+# Finished jobs are kept this long for the status endpoint
+JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', str(7 * 24 * 3600)))
+
+# Bulk workflow actions (POST /api/cases/workflow/bulk)
+BULK_WORKFLOW_CHUNK_SIZE = int(os.environ.get('BULK_WORKFLOW_CHUNK_SIZE', '500'))  # cases per read and bulk_write
+BULK_WORKFLOW_MAX_CASES = int(os.environ.get('BULK_WORKFLOW_MAX_CASES', '5000'))
+
+# HTTP server, used by `python server.py`
+HOST = os.environ.get('HOST', '0.0.0.0')
+PORT = int(os.environ.get('PORT', '8001'))
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+
+def mongo_client_options() -> dict:
+    """Keyword arguments for the Motor client"""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+    }
+    if MONGO_MAX_IDLE_TIME_MS:
+        options["maxIdleTimeMS"] = MONGO_MAX_IDLE_TIME_MS
+    if MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = MONGO_SOCKET_TIMEOUT_MS
+    if MONGO_WRITE_CONCERN_W:
+        options["w"] = int(MONGO_WRITE_CONCERN_W) if MONGO_WRITE_CONCERN_W.isdigit() else MONGO_WRITE_CONCERN_W
+    if MONGO_WRITE_CONCERN_JOURNAL:
+        options["journal"] = MONGO_WRITE_CONCERN_JOURNAL.lower() == "true"
+    if MONGO_WRITE_CONCERN_TIMEOUT_MS:
+        options["wTimeoutMS"] = MONGO_WRITE_CONCERN_TIMEOUT_MS
+    return options
@@ -0,0 +1,31 @@
+"""Dedicated background job consumer.
+
+Runs the same job consumers the API starts in-process, without serving HTTP:
+
+    JOB_WORKERS=4 python worker.py
+
+Start as many of these as needed; jobs are claimed with a lease, so each one
+runs in exactly one consumer at a time. Set JOB_WORKERS=0 on the API processes
+to leave all job processing to dedicated workers.
+"""
+import asyncio
+
+import server
+
+
+async def main():
+    server.connect_database()
+    await server.ensure_indexes()
+    consumers = max(1, server.settings.JOB_WORKERS)
+    server.logger.info(f"Job worker started with {consumers} consumers")
+    await asyncio.gather(
+        server.pending_case_sweeper(),
+        *(server.job_worker(server.job_worker_id(index)) for index in range(consumers)),
+    )
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -133,8 +133,8 @@ class CaseManagementTester:
             200
         )
         
-        if success and isinstance(response, list):
-            print(f"✅ Retrieved {len(response)} cases")
+        if success and isinstance(response.get('items'), list):
+            print(f"✅ Retrieved {len(response['items'])} cases")
             return True
         
         print("❌ Failed to retrieve cases")
@@ -277,8 +277,9 @@ class CaseManagementTester:
             # For assistant, test workflow actions
             elif role == "registrar_assistant":
                 # Get cases to find one assigned to this assistant
-                success, cases = self.run_test("Get assigned cases", "GET", "/api/cases", 200)
-                if success and isinstance(cases, list) and cases:
+                success, page = self.run_test("Get assigned cases", "GET", f"/api/cases?assigned_to={self.user_info.get('id')}", 200)
+                cases = page.get('items', []) if success else []
+                if cases:
                     for case in cases:
                         if case.get('assigned_to') == self.user_info.get('id'):
                             # Test review action
@@ -0,0 +1,88 @@
+"""Benchmark: per-case /api/cases/submit loop vs. /api/cases/submit/bulk.
+
+mongomock checks unique indexes with a scan per insert, so --mock numbers are
+dominated by that and only meaningful for relative comparisons at small sizes.
+
+Usage:
+    python benchmarks/bulk_submit.py --mongo-url mongodb://localhost:27017 --cases 10000
+    python benchmarks/bulk_submit.py --mock --cases 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from common import add_mongo_arguments, api_client, load_server, sample_submitter_data, start_server, write_report
+
+CASE_TYPES = ["birth_registration", "business_registration", "land_registration"]
+
+
+def make_submissions(count):
+    return [
+        {
+            "case_type": CASE_TYPES[i % len(CASE_TYPES)],
+            "submitter_data": sample_submitter_data(CASE_TYPES[i % len(CASE_TYPES)], i),
+            "documents": [],
+            "submitted_by": "bulk-benchmark",
+        }
+        for i in range(count)
+    ]
+
+
+async def run_single(client, submissions, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit(submission):
+        async with semaphore:
+            response = await client.post("/api/cases/submit", json=submission)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(submit(submission) for submission in submissions))
+    return time.perf_counter() - started
+
+
+async def run_bulk_json(client, submissions):
+    started = time.perf_counter()
+    response = await client.post("/api/cases/submit/bulk", json=submissions)
+    response.raise_for_status()
+    assert response.json()["inserted"] == len(submissions)
+    return time.perf_counter() - started
+
+
+async def run_bulk_ndjson(client, submissions):
+    body = "\n".join(json.dumps(submission) for submission in submissions)
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/cases/submit/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    response.raise_for_status()
+    assert response.json()["inserted"] == len(submissions)
+    return time.perf_counter() - started
+
+
+async def main(args):
+    server = load_server(args)
+    submissions = make_submissions(args.cases)
+    results = {"cases": args.cases, "concurrency": args.concurrency}
+
+    for name, run in [
+        ("single", lambda client: run_single(client, submissions, args.concurrency)),
+        ("bulk_json", lambda client: run_bulk_json(client, submissions)),
+        ("bulk_ndjson", lambda client: run_bulk_ndjson(client, submissions)),
+    ]:
+        await start_server(server, args)
+        async with api_client(server) as client:
+            elapsed = await run(client)
+        results[name] = {"elapsed_s": round(elapsed, 4), "cases_per_s": round(args.cases / elapsed, 1)}
+
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--cases", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=20, help="parallel requests for the per-case loop")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""Benchmark: per-case /api/cases/{id}/workflow loop vs. /api/cases/workflow/bulk.
+
+Seeds `--cases` submitted cases, assigns half of them one request at a time
+(as the dashboard did) and the other half with bulk requests of `--batch`
+case ids, then reports elapsed time and cases per second for both.
+
+The gain comes from round trips: one request, one read and one bulk_write per
+chunk instead of a request and three writes per case. mongomock scans the whole
+collection for every update in either path, so --mock numbers understate it.
+
+Usage:
+    python benchmarks/bulk_workflow.py --mongo-url mongodb://localhost:27017 --cases 2000
+    python benchmarks/bulk_workflow.py --mock --cases 400
+"""
+import argparse
+import asyncio
+import time
+
+from common import add_mongo_arguments, api_client, load_server, login, sample_submitter_data, start_server, write_report
+
+
+async def seed(client, count):
+    submissions = [
+        {
+            "case_type": "birth_registration",
+            "submitter_data": sample_submitter_data("birth_registration", i),
+            "documents": [],
+            "submitted_by": "bulk-workflow-benchmark",
+        }
+        for i in range(count)
+    ]
+    response = await client.post("/api/cases/submit/bulk", json=submissions)
+    response.raise_for_status()
+    return [result["case_id"] for result in response.json()["results"] if result["success"]]
+
+
+async def per_case(client, headers, case_ids, assignee):
+    for case_id in case_ids:
+        response = await client.post(
+            f"/api/cases/{case_id}/workflow",
+            headers=headers,
+            json={"action": "assign", "assigned_to": assignee, "expected_status": "submitted"},
+        )
+        response.raise_for_status()
+    return len(case_ids)
+
+
+async def bulk(client, headers, case_ids, assignee, batch):
+    requests = 0
+    for start in range(0, len(case_ids), batch):
+        response = await client.post(
+            "/api/cases/workflow/bulk",
+            headers=headers,
+            json={"case_ids": case_ids[start:start + batch], "action": "assign", "assigned_to": assignee, "expected_status": "submitted"},
+        )
+        response.raise_for_status()
+        if response.json()["failed"]:
+            raise RuntimeError(f"Bulk assign failed for {response.json()['failed']} cases")
+        requests += 1
+    return requests
+
+
+def timing(cases, requests, elapsed):
+    return {
+        "cases": cases,
+        "requests": requests,
+        "elapsed_s": round(elapsed, 4),
+        "cases_per_s": round(cases / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def main(args):
+    server = load_server(args)
+    await start_server(server, args)
+
+    async with api_client(server) as client:
+        case_ids = await seed(client, args.cases)
+        headers = await login(client)
+        assignee = (await client.get("/api/users", headers=headers)).json()[0]["id"]
+        half = len(case_ids) // 2
+
+        started = time.perf_counter()
+        requests = await per_case(client, headers, case_ids[:half], assignee)
+        loop = timing(half, requests, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        requests = await bulk(client, headers, case_ids[half:], assignee, args.batch)
+        batched = timing(len(case_ids) - half, requests, time.perf_counter() - started)
+
+    write_report({
+        "batch": args.batch,
+        "chunk_size": server.settings.BULK_WORKFLOW_CHUNK_SIZE,
+        "per_case_loop": loop,
+        "bulk": batched,
+        "speedup": round(batched["cases_per_s"] / loop["cases_per_s"], 1) if loop["cases_per_s"] else None,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200, help="case ids per bulk request")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
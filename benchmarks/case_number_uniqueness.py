@@ -0,0 +1,60 @@
+"""Concurrency check: case numbers stay unique under parallel submissions.
+
+Fires `--submissions` concurrent POST /api/cases/submit requests and exits
+non-zero if any case number is issued twice.
+
+Usage:
+    python benchmarks/case_number_uniqueness.py --mongo-url mongodb://localhost:27017
+    python benchmarks/case_number_uniqueness.py --mock --block-size 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+from common import add_mongo_arguments, api_client, load_server, sample_submitter_data, start_server, write_report
+
+CASE_TYPES = ["birth_registration", "business_registration", "land_registration"]
+
+
+async def main(args):
+    os.environ["CASE_NUMBER_BLOCK_SIZE"] = str(args.block_size)
+    server = load_server(args)
+    await start_server(server, args)
+
+    async with api_client(server) as client:
+        async def submit(index):
+            response = await client.post("/api/cases/submit", json={
+                "case_type": CASE_TYPES[index % len(CASE_TYPES)],
+                "submitter_data": sample_submitter_data(CASE_TYPES[index % len(CASE_TYPES)], index),
+                "submitted_by": "uniqueness-check",
+            })
+            response.raise_for_status()
+            return response.json()["case_number"]
+
+        started = time.perf_counter()
+        numbers = await asyncio.gather(*(submit(i) for i in range(args.submissions)))
+        elapsed = time.perf_counter() - started
+
+    duplicates = {number: count for number, count in Counter(numbers).items() if count > 1}
+    stored = len(await server.db.cases.distinct("case_number"))
+    write_report({
+        "submissions": args.submissions,
+        "block_size": args.block_size,
+        "elapsed_s": round(elapsed, 4),
+        "unique_case_numbers": len(set(numbers)),
+        "stored_case_numbers": stored,
+        "duplicates": duplicates,
+    }, args.output)
+    return 1 if duplicates or stored != args.submissions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--submissions", type=int, default=500)
+    parser.add_argument("--block-size", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
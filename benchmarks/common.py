@@ -0,0 +1,90 @@
+"""Shared helpers for the benchmark scripts.
+
+Scripts run the FastAPI app in-process through httpx's ASGI transport, backed
+by either a live mongod (`--mongo-url`) or mongomock (`--mock`).
+"""
+import json
+import os
+import statistics
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def sample_submitter_data(case_type, index):
+    """submitter_data that passes the case type schema"""
+    email = f"applicant{index}@example.com"
+    if case_type == "birth_registration":
+        return {"child_name": f"Child {index}", "mother_name": f"Mother {index}", "contact_email": email}
+    if case_type == "business_registration":
+        return {"business_name": f"Business {index}", "owner_name": f"Owner {index}", "contact_email": email}
+    return {"owner_name": f"Owner {index}", "parcel_id": f"P-{index:07d}", "contact_email": email}
+
+
+def add_mongo_arguments(parser):
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="case_management_bench")
+    parser.add_argument("--mock", action="store_true", help="use mongomock instead of a live mongod")
+
+
+def load_server(args):
+    """Import backend/server.py pointed at the benchmark database"""
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["MONGO_DB_NAME"] = args.db_name
+    # Every benchmark client shares one address, so the per-IP limits would throttle the
+    # run; overload.py exercises the limiter by setting its own values first
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "off")
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    import server
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+        server.client = AsyncMongoMockClient()
+        server.db = server.client[args.db_name]
+    else:
+        server.connect_database()
+    return server
+
+
+async def start_server(server, args):
+    """Drop the benchmark database and run the app's startup hook"""
+    await server.client.drop_database(args.db_name)
+    await server.startup_event()
+
+
+def api_client(server):
+    import httpx
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench", timeout=None)
+
+
+async def login(client, username="registrar1", password="reg123"):
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def write_report(results, path):
+    print(json.dumps(results, indent=2))
+    if path:
+        with open(path, "w") as fh:
+            json.dump(results, fh, indent=2)
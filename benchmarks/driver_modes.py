@@ -0,0 +1,97 @@
+"""Concurrency benchmark: blocking pymongo vs. Motor inside async handlers.
+
+Simulates N concurrent requests on a single event loop, each performing the
+same `find_one` a handler would. With pymongo every call blocks the loop, so
+latency grows with concurrency; with Motor the calls overlap.
+
+Usage:
+    python benchmarks/driver_modes.py --mongo-url mongodb://localhost:27017
+    python benchmarks/driver_modes.py --mock --rtt-ms 2
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from common import add_mongo_arguments, summarize, write_report
+
+
+def make_clients(args):
+    if args.mock:
+        import mongomock
+        from mongomock_motor import AsyncMongoMockClient
+        return mongomock.MongoClient(), AsyncMongoMockClient()
+    import pymongo
+    from motor.motor_asyncio import AsyncIOMotorClient
+    return (
+        pymongo.MongoClient(args.mongo_url, maxPoolSize=args.pool_size),
+        AsyncIOMotorClient(args.mongo_url, maxPoolSize=args.pool_size),
+    )
+
+
+async def run_sync_mode(collection, ids, concurrency, rtt):
+    async def handler(case_id, arrived):
+        if rtt:
+            time.sleep(rtt)  # stand-in network round trip, blocks like pymongo does
+        collection.find_one({"id": case_id})
+        return time.perf_counter() - arrived
+
+    return await drive(handler, ids, concurrency)
+
+
+async def run_async_mode(collection, ids, concurrency, rtt):
+    async def handler(case_id, arrived):
+        if rtt:
+            await asyncio.sleep(rtt)  # stand-in network round trip
+        await collection.find_one({"id": case_id})
+        return time.perf_counter() - arrived
+
+    return await drive(handler, ids, concurrency)
+
+
+async def drive(handler, ids, concurrency):
+    latencies = []
+    started = time.perf_counter()
+    for offset in range(0, len(ids), concurrency):
+        batch = ids[offset:offset + concurrency]
+        # Latency is measured from arrival, so time spent queued behind a blocked loop counts
+        arrived = time.perf_counter()
+        latencies.extend(await asyncio.gather(*(handler(case_id, arrived) for case_id in batch)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def main(args):
+    sync_client, async_client = make_clients(args)
+    sync_db = sync_client[args.db_name]
+    async_db = async_client[args.db_name]
+
+    ids = [str(uuid.uuid4()) for _ in range(args.cases)]
+    sync_db.cases.drop()
+    sync_db.cases.insert_many([{"id": case_id, "status": "submitted"} for case_id in ids])
+    if args.mock:
+        # mongomock clients do not share storage, seed the async side separately
+        await async_db.cases.insert_many([{"id": case_id, "status": "submitted"} for case_id in ids])
+
+    rtt = args.rtt_ms / 1000.0
+    lookups = [ids[i % len(ids)] for i in range(args.requests)]
+    results = {"concurrency": args.concurrency, "rtt_ms": args.rtt_ms, "mock": args.mock}
+    results["pymongo"] = await run_sync_mode(sync_db.cases, lookups, args.concurrency, rtt)
+    results["motor"] = await run_async_mode(async_db.cases, lookups, args.concurrency, rtt)
+
+    write_report(results, args.output)
+
+    sync_db.cases.drop()
+    sync_client.close()
+    async_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated round trip added to every query")
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,194 @@
+"""Load test: mixed traffic against the case API with concurrent clients.
+
+Seeds `--cases` cases through the bulk submission endpoint, then runs
+`--clients` concurrent virtual users for `--duration` seconds. Each user picks
+an operation from a weighted mix (login, submit, list, detail, workflow,
+stats) and the report gives throughput and p50/p95/p99 per operation.
+
+Pass `--baseline` with the JSON report of an earlier run to print the change
+in p95 and throughput per operation, so regressions show up run to run.
+
+Usage:
+    python benchmarks/load_test.py --mongo-url mongodb://localhost:27017 --cases 10000 --output run.json
+    python benchmarks/load_test.py --mock --cases 500 --duration 10 --baseline run.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from common import add_mongo_arguments, api_client, load_server, sample_submitter_data, start_server, summarize, write_report
+
+CASE_TYPES = ["birth_registration", "business_registration", "land_registration"]
+DEFAULT_MIX = "login=1,submit=10,list=40,detail=30,workflow=10,stats=9"
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def make_submission(index):
+    return {
+        "case_type": CASE_TYPES[index % len(CASE_TYPES)],
+        "submitter_data": sample_submitter_data(CASE_TYPES[index % len(CASE_TYPES)], index),
+        "documents": [],
+        "submitted_by": "load-test",
+    }
+
+
+async def seed(client, count, batch_size):
+    for offset in range(0, count, batch_size):
+        batch = [make_submission(i) for i in range(offset, min(count, offset + batch_size))]
+        response = await client.post("/api/cases/submit/bulk", json=batch)
+        response.raise_for_status()
+
+
+class Session:
+    """State shared by the virtual users: auth, known case ids, submission counter"""
+
+    def __init__(self, client, headers, user_id, case_ids, rng):
+        self.client = client
+        self.headers = headers
+        self.user_id = user_id
+        self.case_ids = case_ids
+        self.rng = rng
+        self.submitted = len(case_ids)
+
+
+async def op_login(session):
+    return await session.client.post("/api/auth/login", json={"username": "registrar1", "password": "reg123"})
+
+
+async def op_submit(session):
+    session.submitted += 1
+    response = await session.client.post("/api/cases/submit", json=make_submission(session.submitted))
+    if response.status_code == 200:
+        session.case_ids.append(response.json()["case_id"])
+    return response
+
+
+async def op_list(session):
+    params = {"limit": 20}
+    if session.rng.random() < 0.5:
+        params["status"] = "submitted"
+    return await session.client.get("/api/cases", headers=session.headers, params=params)
+
+
+async def op_detail(session):
+    case_id = session.rng.choice(session.case_ids)
+    return await session.client.get(f"/api/cases/{case_id}", headers=session.headers)
+
+
+async def op_workflow(session):
+    case_id = session.rng.choice(session.case_ids)
+    return await session.client.post(
+        f"/api/cases/{case_id}/workflow",
+        headers=session.headers,
+        json={"case_id": case_id, "action": "assign", "assigned_to": session.user_id, "comment": "load test"},
+    )
+
+
+async def op_stats(session):
+    return await session.client.get("/api/dashboard/stats", headers=session.headers)
+
+
+OPERATIONS = {
+    "login": op_login,
+    "submit": op_submit,
+    "list": op_list,
+    "detail": op_detail,
+    "workflow": op_workflow,
+    "stats": op_stats,
+}
+
+
+async def virtual_user(session, mix, deadline, latencies, errors):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        name = session.rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        response = await OPERATIONS[name](session)
+        latencies[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors[name] = errors.get(name, 0) + 1
+
+
+def compare(results, baseline):
+    """p95 and throughput change per operation against an earlier report"""
+    changes = {}
+    for name, current in results["operations"].items():
+        previous = baseline.get("operations", {}).get(name)
+        if not previous:
+            continue
+        changes[name] = {
+            "p95_ms": round(current["p95_ms"] - previous["p95_ms"], 3),
+            "p95_pct": round((current["p95_ms"] / previous["p95_ms"] - 1) * 100, 1) if previous["p95_ms"] else None,
+            "throughput_rps": round(current["throughput_rps"] - previous["throughput_rps"], 1),
+        }
+    return changes
+
+
+async def main(args):
+    mix = parse_mix(args.mix)
+    server = load_server(args)
+    await start_server(server, args)
+
+    async with api_client(server) as client:
+        started = time.perf_counter()
+        await seed(client, args.cases, args.batch_size)
+        seed_elapsed = time.perf_counter() - started
+
+        response = await client.post("/api/auth/login", json={"username": "registrar1", "password": "reg123"})
+        response.raise_for_status()
+        user_id = response.json()["user"]["id"]
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        case_ids = [case["id"] async for case in server.db.cases.find({}, {"id": 1})]
+
+        rng = random.Random(args.seed)
+        session = Session(client, headers, user_id, case_ids, rng)
+        latencies = {name: [] for name in mix}
+        errors = {}
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(session, mix, deadline, latencies, errors) for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    results = {
+        "cases": args.cases,
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "mix": mix,
+        "mock": args.mock,
+        "seed_s": round(seed_elapsed, 2),
+        "overall": summarize(all_latencies, elapsed),
+        "operations": {name: summarize(values, elapsed) for name, values in latencies.items() if values},
+        "errors": errors,
+    }
+    if args.baseline:
+        with open(args.baseline) as fh:
+            results["change_vs_baseline"] = compare(results, json.load(fh))
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--cases", type=int, default=1000, help="cases seeded before the run")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted operation mix, e.g. list=5,detail=3")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the operation sequence")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
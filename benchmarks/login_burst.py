@@ -0,0 +1,74 @@
+"""Load test: latency of unrelated endpoints during a login storm.
+
+Polls GET /api/cases from a steady client, first while idle and then while
+`--logins` concurrent logins hit /api/auth/login. With bcrypt running on the
+password pool the two latency profiles should stay close.
+
+Usage:
+    python benchmarks/login_burst.py --mongo-url mongodb://localhost:27017
+    python benchmarks/login_burst.py --mock --logins 200
+"""
+import argparse
+import asyncio
+import time
+
+from common import add_mongo_arguments, api_client, load_server, login, start_server, summarize, write_report
+
+
+async def poll(client, headers, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/cases", headers=headers, params={"limit": 20})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+
+
+async def measure(client, headers, pollers, during=None, duration=None):
+    stop = asyncio.Event()
+    latencies = []
+    tasks = [asyncio.create_task(poll(client, headers, stop, latencies)) for _ in range(pollers)]
+    started = time.perf_counter()
+    if during is not None:
+        await during
+    else:
+        await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*tasks)
+    return summarize(latencies, elapsed), elapsed
+
+
+async def main(args):
+    server = load_server(args)
+    await start_server(server, args)
+
+    async with api_client(server) as client:
+        headers = await login(client)
+
+        async def login_storm():
+            async def one():
+                response = await client.post("/api/auth/login", json={"username": "assistant1", "password": "ass123"})
+                response.raise_for_status()
+            await asyncio.gather(*(one() for _ in range(args.logins)))
+
+        burst, burst_elapsed = await measure(client, headers, args.pollers, during=login_storm())
+        idle, _ = await measure(client, headers, args.pollers, duration=burst_elapsed)
+
+    write_report({
+        "logins": args.logins,
+        "password_hash_workers": server.PASSWORD_HASH_WORKERS,
+        "bcrypt_rounds": server.BCRYPT_ROUNDS,
+        "login_storm_s": round(burst_elapsed, 4),
+        "cases_idle": idle,
+        "cases_during_login_storm": burst,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--pollers", type=int, default=4, help="concurrent clients polling /api/cases")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""Load test: admission control and rate limiting under synthetic overload.
+
+Runs three floods against the app, each from its own client address, while a
+well-behaved user polls GET /api/cases from another address:
+
+  login_flood   `--logins` concurrent wrong-password logins from one IP
+  submit_flood  `--submissions` concurrent submissions from one X-Client-Id
+  burst         `--burst` concurrent case listings spread over many IPs, so only
+                the concurrency cap (`--max-concurrent`) stands in the way
+
+For each flood the report gives the status code counts, latency of accepted
+and rejected requests (rejections should cost well under a millisecond), and
+the polling user's latency, next to the rejection counters from /metrics.
+
+Usage:
+    python benchmarks/overload.py --mock
+    python benchmarks/overload.py --mongo-url mongodb://localhost:27017 --backend mongo --burst 2000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from common import add_mongo_arguments, load_server, login, sample_submitter_data, start_server, summarize, write_report
+
+
+def address_client(server, ip):
+    transport = httpx.ASGITransport(app=server.app, client=(ip, 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None)
+
+
+async def timed(request):
+    started = time.perf_counter()
+    response = await request
+    return response.status_code, time.perf_counter() - started
+
+
+def report(outcomes, elapsed):
+    statuses = {}
+    for status, _ in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "statuses": statuses,
+        "accepted": summarize([latency for status, latency in outcomes if status not in (429, 503)], elapsed),
+        "rejected": summarize([latency for status, latency in outcomes if status in (429, 503)], elapsed),
+    }
+
+
+async def poll(client, headers, stop, latencies, statuses):
+    while not stop.is_set():
+        status, latency = await timed(client.get("/api/cases", headers=headers, params={"limit": 20}))
+        latencies.append(latency)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        await asyncio.sleep(0.01)
+
+
+async def flood(poller, headers, requests):
+    stop = asyncio.Event()
+    latencies, statuses = [], {}
+    polling = asyncio.create_task(poll(poller, headers, stop, latencies, statuses))
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(timed(request) for request in requests))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await polling
+    result = report(outcomes, elapsed)
+    result["poller"] = {**summarize(latencies, elapsed), "statuses": statuses}
+    return result
+
+
+async def main(args):
+    os.environ["RATE_LIMIT_BACKEND"] = args.backend
+    os.environ["MAX_CONCURRENT_REQUESTS"] = str(args.max_concurrent)
+    server = load_server(args)
+    await start_server(server, args)
+    import ratelimit
+
+    results = {"backend": args.backend, "max_concurrent": args.max_concurrent, "floods": {}}
+    async with address_client(server, "10.0.0.1") as poller, address_client(server, "10.0.0.66") as attacker:
+        headers = await login(poller)
+
+        results["floods"]["login_flood"] = await flood(poller, headers, [
+            attacker.post("/api/auth/login", json={"username": "admin", "password": f"guess-{i}"})
+            for i in range(args.logins)
+        ])
+
+        client_headers = {"X-Client-Id": "front-office-7"}
+        results["floods"]["submit_flood"] = await flood(poller, headers, [
+            attacker.post("/api/cases/submit", headers=client_headers, json={
+                "case_type": "birth_registration",
+                "submitter_data": sample_submitter_data("birth_registration", i),
+                "submitted_by": "overload",
+            })
+            for i in range(args.submissions)
+        ])
+
+        crowd = [address_client(server, f"10.1.{i // 250}.{i % 250}") for i in range(args.burst)]
+        try:
+            results["floods"]["burst"] = await flood(poller, headers, [
+                client.get("/api/cases", headers=headers, params={"limit": 20}) for client in crowd
+            ])
+        finally:
+            await asyncio.gather(*(client.aclose() for client in crowd))
+
+    results["rejected_total"] = {
+        ":".join(label for label in labels if label): value for labels, value in ratelimit.requests_rejected.values.items()
+    }
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--backend", default="memory", choices=["memory", "mongo"], help="rate limit bucket store")
+    parser.add_argument("--max-concurrent", type=int, default=32, help="MAX_CONCURRENT_REQUESTS for the run")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--submissions", type=int, default=300)
+    parser.add_argument("--burst", type=int, default=500)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""Benchmark: GET /api/cases/search over a synthetic case dataset.
+
+Seeds `--cases` cases straight into the database (names and parcel ids drawn
+from fixed pools so terms have a spread of selectivities), then times
+searches for rare, common and exact-identifier terms.
+
+Usage:
+    python benchmarks/search.py --mongo-url mongodb://localhost:27017 --cases 1000000
+    python benchmarks/search.py --mock --cases 20000
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from common import add_mongo_arguments, api_client, load_server, login, start_server, summarize, write_report
+
+FIRST_NAMES = ["ana", "joao", "maria", "pedro", "rui", "sofia", "tiago", "ines", "miguel", "beatriz"]
+LAST_NAMES = ["silva", "santos", "costa", "pereira", "oliveira", "martins", "ferreira", "rodrigues"]
+STATUSES = ["submitted", "assigned", "under_review", "approved", "rejected"]
+CASE_TYPES = ["birth_registration", "business_registration", "land_registration"]
+
+
+def synthetic_case(server, index, rng, started):
+    case_type = CASE_TYPES[index % len(CASE_TYPES)]
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    if case_type == "birth_registration":
+        submitter_data = {"child_name": name, "mother_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"}
+    elif case_type == "business_registration":
+        submitter_data = {"business_name": f"{rng.choice(LAST_NAMES).title()} Trading {index}", "owner_name": name}
+    else:
+        submitter_data = {"parcel_id": f"P-{index:07d}/{index % 9}", "owner_name": name}
+    case_number = server.format_case_number(case_type, 2025, index + 1)
+    created_at = started - timedelta(seconds=index)
+    return {
+        "id": str(uuid.uuid4()),
+        "case_type": case_type,
+        "case_number": case_number,
+        "submitter_data": submitter_data,
+        "documents": [],
+        "status": rng.choice(STATUSES),
+        "assigned_to": None,
+        "assigned_team": None,
+        "workflow_history": [],
+        "history_count": 0,
+        "search_terms": server.case_search_terms(case_number, submitter_data, case_type),
+        "applicant_name": server.CASE_TYPES[case_type].applicant_name(submitter_data),
+        "index_fields": server.CASE_TYPES[case_type].index_values(submitter_data),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+async def seed(server, count, batch_size):
+    rng = random.Random(42)
+    started = datetime.utcnow()
+    for offset in range(0, count, batch_size):
+        batch = [synthetic_case(server, i, rng, started) for i in range(offset, min(count, offset + batch_size))]
+        await server.db.cases.insert_many(batch, ordered=False)
+
+
+async def main(args):
+    server = load_server(args)
+    await start_server(server, args)
+
+    started = time.perf_counter()
+    await seed(server, args.cases, args.batch_size)
+    seed_elapsed = time.perf_counter() - started
+
+    land_index = (args.cases // 2) // len(CASE_TYPES) * len(CASE_TYPES) + CASE_TYPES.index("land_registration")
+    queries = {
+        "common_term": "silva",
+        "two_terms": "maria costa",
+        "parcel_id": f"P-{land_index:07d}/{land_index % 9}",
+        "case_number": server.format_case_number("birth_registration", 2025, 1),
+        "no_match": "nonexistent",
+    }
+    results = {"cases": args.cases, "seed_s": round(seed_elapsed, 2), "queries": {}}
+    async with api_client(server) as client:
+        headers = await login(client)
+        for name, query in queries.items():
+            latencies = []
+            total = None
+            bench_started = time.perf_counter()
+            for _ in range(args.repeat):
+                request_started = time.perf_counter()
+                response = await client.get("/api/cases/search", headers=headers, params={"q": query})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - request_started)
+                total = response.json()["total"]
+            results["queries"][name] = {"q": query, "matches": total, **summarize(latencies, time.perf_counter() - bench_started)}
+
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--cases", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20, help="requests per query")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""Benchmark: time to serialize one page of cases, before and after orjson.
+
+Builds synthetic full case documents with a nested `submitter_data` and times
+the serialization step alone (no database, no HTTP):
+
+  jsonable_encoder  the old path: stringify _id and dates by hand, run the
+                    dict through FastAPI's jsonable_encoder, then json.dumps
+  json_stream       the old streamed list page: json.dumps per document
+  orjson_stream     the current streamed list page: orjson.dumps per document
+  orjson_response   the current detail/users path: FastJSONResponse.render
+
+Usage:
+    python benchmarks/serialization.py --page-size 50 --repeat 200
+    python benchmarks/serialization.py --page-size 500 --fields 100
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from common import add_mongo_arguments, load_server, summarize, write_report
+
+
+def synthetic_case(index, fields):
+    created_at = datetime.utcnow() - timedelta(minutes=index)
+    return {
+        "id": str(uuid.uuid4()),
+        "case_type": "land_registration",
+        "case_number": f"LR-2025-{index + 1:04d}",
+        "submitter_data": {
+            "owner_name": f"Owner {index}",
+            "parcels": [{"parcel_id": f"P-{index:07d}/{n}", "area_m2": 120.5 * n, "surveyed": n % 2 == 0} for n in range(5)],
+            "extra": {f"field_{n}": f"value {n} for case {index}" for n in range(fields)},
+        },
+        "documents": [],
+        "status": "submitted",
+        "assigned_to": None,
+        "assigned_team": None,
+        "workflow_history": [
+            {"action": "submitted", "timestamp": created_at, "comment": "Case submitted from front-office"},
+        ],
+        "history_count": 1,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def legacy_encode(page):
+    encoded = []
+    for case in page:
+        case = {**case, "_id": ObjectId()}
+        case["_id"] = str(case["_id"])
+        case["created_at"] = case["created_at"].isoformat()
+        case["updated_at"] = case["updated_at"].isoformat()
+        encoded.append(jsonable_encoder(case))
+    return json.dumps(encoded).encode()
+
+
+def make_serializers(server):
+    import orjson
+
+    return {
+        "jsonable_encoder": legacy_encode,
+        "json_stream": lambda page: b"".join(
+            json.dumps(case, default=server.json_default).encode() for case in page
+        ),
+        "orjson_stream": lambda page: b"".join(
+            orjson.dumps(case, default=server.json_default) for case in page
+        ),
+        "orjson_response": lambda page: server.FastJSONResponse(page).body,
+    }
+
+
+def main(args):
+    server = load_server(args)
+    page = [synthetic_case(i, args.fields) for i in range(args.page_size)]
+    results = {"page_size": args.page_size, "fields": args.fields, "repeat": args.repeat, "serializers": {}}
+    for name, serialize in make_serializers(server).items():
+        size = len(serialize(page))
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            page_started = time.perf_counter()
+            serialize(page)
+            latencies.append(time.perf_counter() - page_started)
+        summary = summarize(latencies, time.perf_counter() - started)
+        summary["bytes"] = size
+        results["serializers"][name] = summary
+    baseline = results["serializers"]["jsonable_encoder"]["mean_ms"]
+    for summary in results["serializers"].values():
+        summary["speedup"] = round(baseline / summary["mean_ms"], 1) if summary["mean_ms"] else None
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mongo_arguments(parser)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--fields", type=int, default=40, help="extra submitter_data fields per case")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    main(parser.parse_args())
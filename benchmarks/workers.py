@@ -0,0 +1,123 @@
+"""Benchmark: single-process server vs. multiple uvicorn workers.
+
+Starts `python backend/server.py` once per entry in `--workers` (each run with
+WEB_CONCURRENCY set accordingly), waits for /api/health/ready, then drives
+case list and detail requests over real HTTP from `--clients` concurrent
+clients for `--duration` seconds. Workers are separate processes, so this
+needs a live mongod; mongomock cannot be shared between them.
+
+Usage:
+    python benchmarks/workers.py --mongo-url mongodb://localhost:27017 --workers 1,2,4
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from common import BACKEND_DIR, summarize, write_report
+
+
+async def wait_until_ready(client, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            response = await client.get("/api/health/ready")
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("Server did not become ready")
+
+
+async def seed(client, count):
+    submissions = [
+        {
+            "case_type": "birth_registration",
+            "submitter_data": {"child_name": f"Child {i}", "mother_name": f"Mother {i}"},
+            "documents": [],
+            "submitted_by": "workers-benchmark",
+        }
+        for i in range(count)
+    ]
+    response = await client.post("/api/cases/submit/bulk", json=submissions)
+    response.raise_for_status()
+    return [result["case_id"] for result in response.json()["results"] if result.get("case_id")]
+
+
+async def drive(client, headers, case_ids, clients, duration):
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def user(offset):
+        index = offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            if index % 2:
+                response = await client.get(f"/api/cases/{case_ids[index % len(case_ids)]}", headers=headers)
+            else:
+                response = await client.get("/api/cases", headers=headers, params={"limit": 20})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+            index += clients
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(offset) for offset in range(clients)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run(args, workers, port):
+    env = {
+        **os.environ,
+        "MONGO_URL": args.mongo_url,
+        "MONGO_DB_NAME": args.db_name,
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        # Every benchmark client shares one address and would be throttled as one caller
+        "RATE_LIMIT_BACKEND": "off",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "server.py"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30, limits=limits) as client:
+            await wait_until_ready(client, args.startup_timeout)
+            response = await client.post("/api/auth/login", json={"username": "registrar1", "password": "reg123"})
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            case_ids = await seed(client, args.cases)
+            return await drive(client, headers, case_ids, args.clients, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def main(args):
+    from pymongo import MongoClient
+
+    results = {"clients": args.clients, "duration_s": args.duration, "cpu_count": os.cpu_count(), "runs": {}}
+    for workers in [int(value) for value in args.workers.split(",")]:
+        MongoClient(args.mongo_url).drop_database(args.db_name)
+        results["runs"][f"workers_{workers}"] = await run(args, workers, args.port)
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="case_management_bench")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts to compare")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -6,7 +6,10 @@ const API_BASE_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001
 function App() {
   const [currentUser, setCurrentUser] = useState(null);
   const [cases, setCases] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [selectedCase, setSelectedCase] = useState(null);
+  const [history, setHistory] = useState(null);
+  const [selectedIds, setSelectedIds] = useState([]);
   const [users, setUsers] = useState([]);
   const [stats, setStats] = useState({});
   const [loading, setLoading] = useState(false);
@@ -67,7 +70,9 @@ function App() {
     localStorage.removeItem('user');
     setCurrentUser(null);
     setCases([]);
+    setNextCursor(null);
     setSelectedCase(null);
+    setSelectedIds([]);
   };
 
   const fetchDashboardData = async () => {
@@ -78,7 +83,11 @@ function App() {
         fetchWithAuth('/api/dashboard/stats'),
       ]);
 
-      if (casesRes.ok) setCases(await casesRes.json());
+      if (casesRes.ok) {
+        const page = await casesRes.json();
+        setCases(page.items);
+        setNextCursor(page.next_cursor);
+      }
       if (usersRes.ok) setUsers(await usersRes.json());
       if (statsRes.ok) setStats(await statsRes.json());
     } catch (error) {
@@ -86,8 +95,151 @@ function App() {
     }
   };
 
+  // Live case deltas over server-sent events. fetch is used instead of EventSource
+  // so the bearer token can travel in the Authorization header.
+  useEffect(() => {
+    if (!currentUser) return undefined;
+    const controller = new AbortController();
+    let statsTimer = null;
+
+    const refreshStats = () => {
+      clearTimeout(statsTimer);
+      statsTimer = setTimeout(async () => {
+        const res = await fetchWithAuth('/api/dashboard/stats');
+        if (res.ok) setStats(await res.json());
+      }, 500);
+    };
+
+    const applyEvent = (event, data) => {
+      if (event === 'case_created' || event === 'case_updated') {
+        setCases((prev) => {
+          if (prev.some((c) => c.id === data.id)) {
+            return prev.map((c) => (c.id === data.id ? { ...c, ...data } : c));
+          }
+          return [...prev, data].sort((a, b) => b.created_at.localeCompare(a.created_at));
+        });
+        setSelectedCase((prev) => (prev && prev.id === data.id ? { ...prev, ...data } : prev));
+        refreshStats();
+      } else if (event === 'case_removed') {
+        setCases((prev) => prev.filter((c) => c.id !== data.id));
+        refreshStats();
+      }
+    };
+
+    const listen = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const response = await fetchWithAuth('/api/cases/events', { signal: controller.signal });
+          if (!response.ok) return;
+          const reader = response.body.getReader();
+          const decoder = new TextDecoder();
+          let buffer = '';
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const messages = buffer.split('\n\n');
+            buffer = messages.pop();
+            messages.forEach((message) => {
+              let event = 'message';
+              let data = '';
+              message.split('\n').forEach((line) => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+              });
+              if (data) applyEvent(event, JSON.parse(data));
+            });
+          }
+        } catch (error) {
+          if (controller.signal.aborted) return;
+          console.error('Case event stream error:', error);
+        }
+        // The stream ended (network drop or a "resync" from the server): reload what was missed
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+        if (!controller.signal.aborted) fetchDashboardData();
+      }
+    };
+
+    listen();
+    return () => {
+      controller.abort();
+      clearTimeout(statsTimer);
+    };
+  }, [currentUser]);
+
+  const fetchMoreCases = async () => {
+    if (!nextCursor) return;
+    try {
+      const res = await fetchWithAuth(`/api/cases?cursor=${encodeURIComponent(nextCursor)}`);
+      if (res.ok) {
+        const page = await res.json();
+        setCases((prev) => [...prev, ...page.items]);
+        setNextCursor(page.next_cursor);
+      }
+    } catch (error) {
+      console.error('Error fetching more cases:', error);
+    }
+  };
+
+  // List pages only carry case summaries, so load the full case before showing details
+  const openCaseDetail = async (caseId) => {
+    try {
+      const res = await fetchWithAuth(`/api/cases/${caseId}`);
+      if (res.ok) {
+        setSelectedCase(await res.json());
+        setHistory(null);
+        setActiveTab('case-detail');
+      }
+    } catch (error) {
+      console.error('Error fetching case details:', error);
+    }
+  };
+
+  // Cases only carry their latest workflow entries; older ones are paged from the history endpoint
+  const fetchHistory = async (caseId, cursor = null) => {
+    try {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetchWithAuth(`/api/cases/${caseId}/history${query}`);
+      if (res.ok) {
+        const page = await res.json();
+        const older = [...page.items].reverse();
+        setHistory((prev) => ({
+          items: cursor && prev ? [...older, ...prev.items] : older,
+          nextCursor: page.next_cursor,
+        }));
+      }
+    } catch (error) {
+      console.error('Error fetching case history:', error);
+    }
+  };
+
+  // Staff take work from the server-side queue instead of picking from the submitted pool
+  const claimNextCase = async () => {
+    setLoading(true);
+    try {
+      const res = await fetchWithAuth('/api/queue/next', { method: 'POST' });
+      if (res.ok) {
+        const data = await res.json();
+        if (data.case) {
+          setSelectedCase(data.case);
+          setHistory(null);
+          setActiveTab('case-detail');
+        } else {
+          alert('No cases waiting in the queue');
+        }
+      } else {
+        alert('Could not claim a case');
+      }
+    } catch (error) {
+      console.error('Queue claim error:', error);
+    }
+    setLoading(false);
+  };
+
   const handleWorkflowAction = async (caseId, action, assignedTo = null, comment = '') => {
     setLoading(true);
+    // The server rejects the action if the case changed status since we loaded it
+    const current = selectedCase && selectedCase.id === caseId ? selectedCase : cases.find((c) => c.id === caseId);
     try {
       const response = await fetchWithAuth(`/api/cases/${caseId}/workflow`, {
         method: 'POST',
@@ -96,16 +248,21 @@ function App() {
           action,
           assigned_to: assignedTo,
           comment,
+          expected_status: current ? current.status : null,
         }),
       });
 
       if (response.ok) {
-        await fetchDashboardData();
+        const data = await response.json();
+        // The case list and stats are updated by the event stream
         if (selectedCase && selectedCase.id === caseId) {
-          const caseRes = await fetchWithAuth(`/api/cases/${caseId}`);
-          if (caseRes.ok) setSelectedCase(await caseRes.json());
+          setSelectedCase(data.case);
+          setHistory(null);
         }
         alert(`Case ${action} successfully`);
+      } else if (response.status === 409) {
+        await fetchDashboardData();
+        alert('Case was changed by someone else, please review it again');
       } else {
         alert('Action failed');
       }
@@ -116,6 +273,32 @@ function App() {
     setLoading(false);
   };
 
+  const toggleSelected = (caseId) => {
+    setSelectedIds((prev) => (prev.includes(caseId) ? prev.filter((id) => id !== caseId) : [...prev, caseId]));
+  };
+
+  // One request for the whole selection; the event stream updates the list and stats
+  const handleBulkAssign = async (assignedTo) => {
+    setLoading(true);
+    try {
+      const response = await fetchWithAuth('/api/cases/workflow/bulk', {
+        method: 'POST',
+        body: JSON.stringify({ case_ids: selectedIds, action: 'assign', assigned_to: assignedTo }),
+      });
+      if (response.ok) {
+        const data = await response.json();
+        setSelectedIds(data.results.filter((result) => !result.success).map((result) => result.case_id));
+        alert(data.failed ? `${data.updated} cases assigned, ${data.failed} failed` : `${data.updated} cases assigned`);
+      } else {
+        alert('Bulk assignment failed');
+      }
+    } catch (error) {
+      console.error('Bulk workflow action error:', error);
+      alert('Bulk assignment error');
+    }
+    setLoading(false);
+  };
+
   const getCaseTypeLabel = (type) => {
     const labels = {
       birth_registration: 'Birth Registration',
@@ -213,6 +396,15 @@ function App() {
               <span className="text-sm text-gray-700">
                 {currentUser.full_name} ({currentUser.role})
               </span>
+              {['registrar_assistant', 'lawyer', 'notary', 'bailiff', 'registrar'].includes(currentUser.role) && (
+                <button
+                  onClick={claimNextCase}
+                  disabled={loading}
+                  className="bg-indigo-600 text-white px-3 py-1 rounded text-sm hover:bg-indigo-700 disabled:opacity-50"
+                >
+                  Next case
+                </button>
+              )}
               <button
                 onClick={handleLogout}
                 className="bg-red-600 text-white px-3 py-1 rounded text-sm hover:bg-red-700"
@@ -335,10 +527,7 @@ function App() {
                         </div>
                       </div>
                       <button
-                        onClick={() => {
-                          setSelectedCase(case_);
-                          setActiveTab('case-detail');
-                        }}
+                        onClick={() => openCaseDetail(case_.id)}
                         className="text-indigo-600 hover:text-indigo-900 text-sm font-medium"
                       >
                         View
@@ -364,6 +553,36 @@ function App() {
               </button>
             </div>
 
+            {selectedIds.length > 0 && (
+              <div className="bg-indigo-50 border border-indigo-200 rounded px-4 py-3 flex items-center space-x-4">
+                <span className="text-sm text-indigo-900">{selectedIds.length} selected</span>
+                <select
+                  onChange={(e) => {
+                    if (e.target.value) {
+                      handleBulkAssign(e.target.value);
+                      e.target.value = '';
+                    }
+                  }}
+                  disabled={loading}
+                  className="text-sm border border-gray-300 rounded px-2 py-1"
+                  defaultValue=""
+                >
+                  <option value="">Assign selected to...</option>
+                  {users.filter(u => u.role !== 'supervisor').map(user => (
+                    <option key={user.id} value={user.id}>
+                      {user.full_name} ({user.role})
+                    </option>
+                  ))}
+                </select>
+                <button
+                  onClick={() => setSelectedIds([])}
+                  className="text-sm text-gray-600 hover:text-gray-900"
+                >
+                  Clear
+                </button>
+              </div>
+            )}
+
             <div className="bg-white shadow overflow-hidden sm:rounded-md">
               <ul className="divide-y divide-gray-200">
                 {cases.map((case_) => (
@@ -371,13 +590,21 @@ function App() {
                     <div className="px-4 py-4">
                       <div className="flex items-center justify-between">
                         <div className="flex items-center space-x-4">
+                          {['registrar', 'supervisor'].includes(currentUser.role) && (
+                            <input
+                              type="checkbox"
+                              checked={selectedIds.includes(case_.id)}
+                              onChange={() => toggleSelected(case_.id)}
+                            />
+                          )}
                           {getStatusBadge(case_.status)}
                           <div>
                             <div className="text-sm font-medium text-gray-900">
                               {case_.case_number}
                             </div>
                             <div className="text-sm text-gray-500">
-                              {getCaseTypeLabel(case_.case_type)} • Created: {new Date(case_.created_at).toLocaleDateString()}
+                              {getCaseTypeLabel(case_.case_type)}
+                              {case_.applicant_name && ` • ${case_.applicant_name}`} • Created: {new Date(case_.created_at).toLocaleDateString()}
                             </div>
                           </div>
                         </div>
@@ -401,10 +628,7 @@ function App() {
                             </select>
                           )}
                           <button
-                            onClick={() => {
-                              setSelectedCase(case_);
-                              setActiveTab('case-detail');
-                            }}
+                            onClick={() => openCaseDetail(case_.id)}
                             className="text-indigo-600 hover:text-indigo-900 text-sm font-medium"
                           >
                             View Details
@@ -415,6 +639,16 @@ function App() {
                   </li>
                 ))}
               </ul>
+              {nextCursor && (
+                <div className="px-4 py-4 text-center">
+                  <button
+                    onClick={fetchMoreCases}
+                    className="text-indigo-600 hover:text-indigo-900 text-sm font-medium"
+                  >
+                    Load more
+                  </button>
+                </div>
+              )}
             </div>
           </div>
         )}
@@ -518,8 +752,18 @@ function App() {
                 <h3 className="text-lg leading-6 font-medium text-gray-900">Workflow History</h3>
               </div>
               <div className="border-t border-gray-200">
+                {(history ? history.nextCursor : selectedCase.history_count > (selectedCase.workflow_history?.length || 0)) && (
+                  <div className="px-4 py-3 text-center">
+                    <button
+                      onClick={() => fetchHistory(selectedCase.id, history ? history.nextCursor : null)}
+                      className="text-indigo-600 hover:text-indigo-900 text-sm font-medium"
+                    >
+                      Show older entries
+                    </button>
+                  </div>
+                )}
                 <ul className="divide-y divide-gray-200">
-                  {selectedCase.workflow_history?.map((entry, index) => (
+                  {(history ? history.items : selectedCase.workflow_history)?.map((entry, index) => (
                     <li key={index} className="px-4 py-4">
                       <div className="flex items-center justify-between">
                         <div>
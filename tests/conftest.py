@@ -0,0 +1,79 @@
+"""Shared fixtures: the API on an in-memory Mongo (mongomock), driven through httpx.
+
+Every test gets a fresh database and runs the real startup hook (indexes,
+migrations, default users). All tests share one event loop, because the server
+keeps a few module-level asyncio primitives.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+# Read by server.py and settings.py at import
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "off")
+os.environ.setdefault("JOB_WORKERS", "0")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import httpx  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    return loop.run_until_complete
+
+
+@pytest.fixture
+def app(run):
+    server.client = AsyncMongoMockClient()
+    server.db = server.client["case_management_test"]
+    server.user_cache.invalidate()
+    server.user_list_cache.invalidate()
+    server.case_number_blocks.clear()
+    run(server.startup_event())
+    yield server
+    for task in server.background_tasks:
+        task.cancel()
+    run(asyncio.gather(*server.background_tasks, return_exceptions=True))
+    server.background_tasks.clear()
+    server.client = None
+    server.db = None
+
+
+@pytest.fixture
+def api(app, run):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app.app), base_url="http://test")
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture
+def login(api, run):
+    def login(username="registrar1", password="reg123"):
+        response = run(api.post("/api/auth/login", json={"username": username, "password": password}))
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return login
+
+
+def submission(index=0, case_type="birth_registration"):
+    data = {
+        "birth_registration": {"child_name": f"Child {index}", "mother_name": f"Mother {index}"},
+        "business_registration": {"business_name": f"Business {index}", "owner_name": f"Owner {index}"},
+        "land_registration": {"owner_name": f"Owner {index}", "parcel_id": f"P-{index:07d}"},
+    }[case_type]
+    return {"case_type": case_type, "submitter_data": data, "documents": [], "submitted_by": "tests"}
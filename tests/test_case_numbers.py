@@ -0,0 +1,51 @@
+"""Case numbers stay unique under concurrent submissions, with and without preallocated blocks."""
+import asyncio
+
+import pytest
+
+from tests.conftest import submission
+
+CASE_TYPES = ("birth_registration", "business_registration", "land_registration")
+
+
+async def submit_concurrently(api, count, offset=0):
+    responses = await asyncio.gather(*(
+        api.post("/api/cases/submit", json=submission(offset + index, CASE_TYPES[index % len(CASE_TYPES)]))
+        for index in range(count)
+    ))
+    assert {response.status_code for response in responses} == {200}
+    return [response.json()["case_number"] for response in responses]
+
+
+def sequences(case_numbers):
+    """Sequence numbers per case number prefix (type and year)"""
+    by_prefix = {}
+    for case_number in case_numbers:
+        prefix, _, sequence = case_number.rpartition("-")
+        by_prefix.setdefault(prefix, []).append(int(sequence))
+    return {prefix: sorted(values) for prefix, values in by_prefix.items()}
+
+
+@pytest.mark.parametrize("block_size", [1, 7])
+def test_concurrent_submissions_get_distinct_numbers(app, api, run, monkeypatch, block_size):
+    monkeypatch.setattr(app, "CASE_NUMBER_BLOCK_SIZE", block_size)
+    case_numbers = run(submit_concurrently(api, 300))
+
+    assert len(set(case_numbers)) == 300
+    # One process draws its blocks in order, so nothing is skipped
+    for values in sequences(case_numbers).values():
+        assert values == list(range(1, len(values) + 1))
+
+
+def test_restarted_worker_continues_in_a_fresh_block(app, api, run, monkeypatch):
+    monkeypatch.setattr(app, "CASE_NUMBER_BLOCK_SIZE", 7)
+    first = run(submit_concurrently(api, 150))
+    # A restart forgets the rest of the block; the next worker reserves a new one
+    app.case_number_blocks.clear()
+    second = run(submit_concurrently(api, 150, offset=150))
+
+    assert len(set(first) | set(second)) == 300
+    before, after = sequences(first), sequences(second)
+    for prefix, values in after.items():
+        start = -(-max(before[prefix]) // 7) * 7 + 1  # First number of the next block
+        assert values == list(range(start, start + len(values)))
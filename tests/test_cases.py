@@ -0,0 +1,59 @@
+"""Case listing: keyset pages and conditional requests."""
+from datetime import datetime
+
+from tests.conftest import submission
+
+
+def page_through(api, run, headers, limit, cursor=None):
+    """Ids of every case from `cursor` on (from the start without one)"""
+    ids = []
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = run(api.get("/api/cases", headers=headers, params=params)).json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def test_keyset_pages_have_no_gaps_or_duplicates(app, api, login, run):
+    headers = login()
+    case_ids = [result["case_id"] for result in run(api.post(
+        "/api/cases/submit/bulk", json=[submission(index) for index in range(23)]
+    )).json()["results"]]
+    # Ties on created_at are broken by id
+    run(app.db.cases.update_many({"id": {"$in": case_ids[5:15]}}, {"$set": {"created_at": datetime(2026, 1, 1)}}))
+    expected = [case["id"] for case in run(app.db.cases.find({}, {"id": 1}).sort([("created_at", -1), ("id", -1)]).to_list(length=None))]
+
+    assert page_through(api, run, headers, 5) == expected
+    assert page_through(api, run, headers, 23) == expected
+
+
+def test_new_cases_do_not_shift_later_pages(app, api, login, run):
+    headers = login()
+    run(api.post("/api/cases/submit/bulk", json=[submission(index) for index in range(10)]))
+    first = run(api.get("/api/cases", headers=headers, params={"limit": 4})).json()
+    run(api.post("/api/cases/submit", json=submission(99)))
+    rest = page_through(api, run, headers, 4, first["next_cursor"])
+    seen = [item["id"] for item in first["items"]] + rest
+    assert len(seen) == len(set(seen)) == 10
+
+
+def test_matching_etag_is_answered_with_304(app, api, login, run):
+    headers = login()
+    case_id = run(api.post("/api/cases/submit", json=submission())).json()["case_id"]
+
+    for path in (f"/api/cases/{case_id}", "/api/cases"):
+        response = run(api.get(path, headers=headers))
+        etag = response.headers["etag"]
+        revalidated = run(api.get(path, headers={**headers, "If-None-Match": etag}))
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+        assert run(api.get(path, headers={**headers, "If-None-Match": 'W/"stale"'})).status_code == 200
+
+    etag = run(api.get(f"/api/cases/{case_id}", headers=headers)).headers["etag"]
+    assignee = run(api.get("/api/users", headers=headers)).json()[0]["id"]
+    run(api.post(f"/api/cases/{case_id}/workflow", headers=headers, json={"action": "assign", "assigned_to": assignee}))
+    changed = run(api.get(f"/api/cases/{case_id}", headers={**headers, "If-None-Match": etag}))
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "assigned"
@@ -0,0 +1,57 @@
+"""Document downloads: byte ranges and Content-Disposition."""
+import pytest
+
+from tests.conftest import submission
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def document(app, api, login, run, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "DOCUMENT_STORAGE_DIR", str(tmp_path))
+    headers = login()
+    case_id = run(api.post("/api/cases/submit", json=submission())).json()["case_id"]
+    response = run(api.post(
+        f"/api/cases/{case_id}/documents", headers=headers, params={"filename": "certidão.pdf"}, content=CONTENT,
+    ))
+    assert response.status_code == 200, response.text
+    return f"/api/cases/{case_id}/documents/{response.json()['document_id']}", headers
+
+
+def download(api, run, document, range_header=None):
+    path, headers = document
+    return run(api.get(path, headers={**headers, **({"Range": range_header} if range_header else {})}))
+
+
+def test_full_download(api, run, document):
+    response = download(api, run, document)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"] == "attachment; filename=\"certid_o.pdf\"; filename*=UTF-8''certid%C3%A3o.pdf"
+
+
+@pytest.mark.parametrize("range_header,start,end", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=1000-", 1000, 1023),
+    ("bytes=-24", 1000, 1023),
+    ("bytes=1000-5000", 1000, 1023),
+])
+def test_satisfiable_range_is_partial(api, run, document, range_header, start, end):
+    response = download(api, run, document, range_header)
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+
+
+def test_range_past_the_end_is_refused(api, run, document):
+    response = download(api, run, document, "bytes=2048-")
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=5-2", "bytes=0-1,5-9", "items=0-9", "bytes=a-b"])
+def test_invalid_range_is_ignored(api, run, document, range_header):
+    response = download(api, run, document, range_header)
+    assert response.status_code == 200
+    assert response.content == CONTENT
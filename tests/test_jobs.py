@@ -0,0 +1,119 @@
+"""The case_submitted job pipeline: recovery of unqueued cases, retries and leases.
+
+Consumers are off in tests (JOB_WORKERS=0); jobs are claimed and run by hand.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from tests.conftest import submission
+
+
+async def drain(server, worker_id="tests"):
+    """Run every job that is due, return how many ran"""
+    ran = 0
+    while True:
+        job = await server.claim_job(worker_id)
+        if job is None:
+            return ran
+        await server.run_job(job, worker_id)
+        ran += 1
+
+
+async def age_cases(server, seconds):
+    await server.db.cases.update_many({}, {"$set": {"created_at": datetime.utcnow() - timedelta(seconds=seconds)}})
+
+
+def test_submitted_case_is_pending_until_its_job_runs(app, api, login, run):
+    response = run(api.post("/api/cases/submit", json=submission()))
+    assert response.status_code == 200
+    case_id, job_id = response.json()["case_id"], response.json()["job_id"]
+    assert run(app.db.cases.find_one({"id": case_id}))["processing_pending"] is True
+
+    assert run(drain(app)) == 1
+    headers = login()
+    assert run(api.get(f"/api/jobs/{job_id}", headers=headers)).json()["status"] == "succeeded"
+    assert "processing_pending" not in run(app.db.cases.find_one({"id": case_id}))
+    history = run(api.get(f"/api/cases/{case_id}/history", headers=headers)).json()["items"]
+    assert [event["id"] for event in history] == [f"{case_id}:0"]
+    assert "processing_pending" not in run(api.get(f"/api/cases/{case_id}", headers=headers)).json()
+
+
+def test_stats_are_counted_once(app, api, login, run):
+    run(api.post("/api/cases/submit", json=submission()))
+    # A reconciliation between the insert and the job must not be added to by the job
+    run(app.reconcile_stats())
+    run(drain(app))
+    headers = login()
+    materialized = run(api.get("/api/dashboard/stats", headers=headers)).json()
+    live = run(api.get("/api/dashboard/stats", params={"source": "live"}, headers=headers)).json()
+    assert materialized["by_status"] == live["by_status"] == {"submitted": 1}
+
+
+def test_failed_enqueue_keeps_the_case_and_the_sweeper_queues_it(app, api, run, monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise RuntimeError("jobs collection unavailable")
+
+    monkeypatch.setattr(app, "enqueue_job", unavailable)
+    response = run(api.post("/api/cases/submit", json=submission()))
+    monkeypatch.undo()
+    assert response.status_code == 200
+    assert response.json()["job_id"] is None
+    case_id = response.json()["case_id"]
+
+    assert run(app.sweep_pending_cases()) == 0  # Not older than a sweep interval yet
+    run(age_cases(app, app.settings.JOB_SWEEP_INTERVAL_SECONDS + 1))
+    assert run(app.sweep_pending_cases()) == 1
+    assert run(drain(app)) == 1
+    assert "processing_pending" not in run(app.db.cases.find_one({"id": case_id}))
+    assert run(app.db.workflow_events.count_documents({"case_id": case_id})) == 1
+
+
+def test_bulk_submission_queues_the_same_jobs(app, api, run):
+    response = run(api.post("/api/cases/submit/bulk", json=[submission(index) for index in range(3)]))
+    case_ids = [result["case_id"] for result in response.json()["results"]]
+    jobs = run(app.db.jobs.find({}, {"case_id": 1, "idempotency_key": 1}).to_list(length=None))
+    assert sorted(job["idempotency_key"] for job in jobs) == sorted(f"case_submitted:{case_id}" for case_id in case_ids)
+
+    # Sweeping cases that already have a job adds nothing
+    run(age_cases(app, app.settings.JOB_SWEEP_INTERVAL_SECONDS + 1))
+    run(app.sweep_pending_cases())
+    assert run(app.db.jobs.count_documents({})) == 3
+    assert run(drain(app)) == 3
+    assert run(app.db.workflow_events.count_documents({})) == 3
+    assert run(app.db.cases.count_documents({"processing_pending": True})) == 0
+
+
+def test_failing_job_is_retried_with_backoff_then_fails(app, run, monkeypatch):
+    monkeypatch.setattr(app.settings, "JOB_MAX_ATTEMPTS", 3)
+    calls = []
+
+    async def flaky(job):
+        calls.append(job["attempts"])
+        await app.job_step(job, "first", lambda: asyncio.sleep(0))
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(app.JOB_HANDLERS, "flaky", flaky)
+    job_id = run(app.enqueue_job("flaky", "case-1"))
+    for attempt in range(1, 4):
+        run(app.db.jobs.update_one({"id": job_id}, {"$set": {"run_at": datetime.utcnow()}}))
+        assert run(drain(app)) == 1
+        job = run(app.db.jobs.find_one({"id": job_id}))
+        assert job["attempts"] == attempt
+        if attempt < 3:
+            assert job["status"] == "pending"
+            assert job["run_at"] > datetime.utcnow()
+    assert job["status"] == "failed"
+    assert job["completed_steps"] == ["first"]
+    assert calls == [1, 2, 3]
+
+
+def test_expired_lease_is_claimed_again(app, run):
+    job_id = run(app.enqueue_job("case_submitted", "case-1"))
+    assert run(app.claim_job("dead-worker"))["id"] == job_id
+    assert run(app.claim_job("other-worker")) is None
+
+    run(app.db.jobs.update_one({"id": job_id}, {"$set": {"locked_until": datetime.utcnow() - timedelta(seconds=1)}}))
+    job = run(app.claim_job("other-worker"))
+    assert job["id"] == job_id
+    assert job["locked_by"] == "other-worker"
+    assert job["attempts"] == 2
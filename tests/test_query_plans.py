@@ -0,0 +1,65 @@
+"""Every declared query shape must be served by an index.
+
+The static check runs everywhere: it matches each shape in server.QUERY_SHAPES
+against the INDEX_MANIFEST. The explain() check needs a live mongod
+(mongomock has no planner) and runs when TEST_MONGO_URL is set.
+"""
+import os
+
+import pytest
+
+import server
+
+
+def filter_branches(filter_query):
+    """Field sets a planner can use, one per $or branch"""
+    if "$or" in filter_query:
+        return [set(branch) for branch in filter_query["$or"]]
+    return [set(filter_query)]
+
+
+def index_keys(collection_name):
+    return [list(index.document["key"].items()) for index in server.INDEX_MANIFEST.get(collection_name, [])]
+
+
+def sort_prefix(keys, sort):
+    """True if the index walks `sort` in either direction"""
+    if len(keys) < len(sort):
+        return False
+    head = keys[:len(sort)]
+    forward = all(key == field and direction == order for (key, direction), (field, order) in zip(head, sort))
+    backward = all(key == field and direction == -order for (key, direction), (field, order) in zip(head, sort))
+    return forward or backward
+
+
+def covered(collection_name, filter_query, sort):
+    indexes = index_keys(collection_name)
+    for fields in filter_branches(filter_query):
+        if fields:
+            if not any(keys[0][0] in fields for keys in indexes):
+                return False
+        elif not sort or not any(sort_prefix(keys, sort) for keys in indexes):
+            return False
+    return True
+
+
+@pytest.mark.parametrize("name,collection_name,filter_query,sort", server.QUERY_SHAPES, ids=[shape[0] for shape in server.QUERY_SHAPES])
+def test_query_shape_has_index(name, collection_name, filter_query, sort):
+    assert covered(collection_name, filter_query, sort), f"No index serves the {name} query"
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_MONGO_URL"), reason="explain() needs a live mongod (set TEST_MONGO_URL)")
+def test_query_plans_avoid_collscan(run):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    server.client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"])
+    server.db = server.client["case_management_query_plan_test"]
+    try:
+        run(server.client.drop_database("case_management_query_plan_test"))
+        run(server.ensure_indexes())
+        run(server.check_query_plans())
+    finally:
+        run(server.client.drop_database("case_management_query_plan_test"))
+        server.client.close()
+        server.client = None
+        server.db = None
@@ -0,0 +1,86 @@
+"""Token buckets and bucket keys of ratelimit.AdmissionMiddleware, in front of an echo app."""
+import json
+
+import httpx
+
+import ratelimit
+
+
+async def echo(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body or b"{}"})
+
+
+def middleware(*rules, store=None):
+    return ratelimit.AdmissionMiddleware(
+        echo, rules=list(rules), store=store or ratelimit.MemoryBucketStore(),
+        identify_user=lambda token: token or None,
+    )
+
+
+def client(app, ip="10.0.0.1"):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(ip, 40000)), base_url="http://test")
+
+
+async def statuses(http, count, path="/api/cases", **kwargs):
+    return [(await http.post(path, **kwargs)).status_code for _ in range(count)]
+
+
+def test_bucket_allows_burst_then_refills(run, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    app = middleware(ratelimit.Rule("api", "/api/", per_minute=60, burst=3))
+
+    async def scenario():
+        async with client(app) as http:
+            assert await statuses(http, 4) == [200, 200, 200, 429]
+            rejected = await http.post("/api/cases")
+            assert rejected.headers["retry-after"] == "1"
+            now[0] += 1  # One token per second
+            assert await statuses(http, 2) == [200, 429]
+    run(scenario())
+
+
+def test_zero_rate_leaves_rule_unlimited(run):
+    app = middleware(ratelimit.Rule("api", "/api/", per_minute=0, burst=0))
+
+    async def scenario():
+        async with client(app) as http:
+            assert set(await statuses(http, 20)) == {200}
+    run(scenario())
+
+
+def test_logins_behind_one_address_are_limited_per_username(run):
+    app = middleware(ratelimit.Rule("login", "/api/auth/login", per_minute=1, burst=2, body_field="username"))
+
+    async def scenario():
+        async with client(app) as http:
+            for username in ("ana", "bruno", "carla", "duarte"):
+                payload = {"username": username, "password": "secret"}
+                response = await http.post("/api/auth/login", json=payload)
+                # The body reaches the endpoint intact after the middleware read it
+                assert json.loads(response.content) == payload
+                assert await statuses(http, 2, "/api/auth/login", json=payload) == [200, 429]
+            # A client id does not buy more guesses for the same username
+            assert await statuses(http, 1, "/api/auth/login", json={"username": "ana"}, headers={"X-Client-Id": "kiosk"}) == [429]
+        async with client(app, ip="10.0.0.2") as http:
+            assert await statuses(http, 1, "/api/auth/login", json={"username": "ana"}) == [200]
+    run(scenario())
+
+
+def test_client_id_and_user_replace_the_address_bucket(run):
+    app = middleware(ratelimit.Rule("submit", "/api/cases/submit", per_minute=1, burst=1))
+
+    async def scenario():
+        async with client(app) as http:
+            assert await statuses(http, 2, "/api/cases/submit") == [200, 429]
+            assert await statuses(http, 2, "/api/cases/submit", headers={"X-Client-Id": "office-1"}) == [200, 429]
+            assert await statuses(http, 1, "/api/cases/submit", headers={"X-Client-Id": "office-2"}) == [200]
+            assert await statuses(http, 1, "/api/cases/submit", headers={"Authorization": "Bearer ana"}) == [200]
+    run(scenario())
@@ -0,0 +1,84 @@
+"""Workflow transitions, single and bulk."""
+import asyncio
+
+from tests.conftest import submission
+
+
+def submit(api, run, count):
+    response = run(api.post("/api/cases/submit/bulk", json=[submission(index) for index in range(count)]))
+    return [result["case_id"] for result in response.json()["results"]]
+
+
+def active_user_id(api, run, headers):
+    return run(api.get("/api/users", headers=headers)).json()[0]["id"]
+
+
+def test_bulk_reports_each_case(app, api, login, run, monkeypatch):
+    monkeypatch.setattr(app.settings, "BULK_WORKFLOW_CHUNK_SIZE", 2)
+    headers = login()
+    case_ids = submit(api, run, 3)
+    assignee = active_user_id(api, run, headers)
+    run(api.post(f"/api/cases/{case_ids[0]}/workflow", headers=headers, json={"action": "assign", "assigned_to": assignee}))
+
+    response = run(api.post("/api/cases/workflow/bulk", headers=headers, json={
+        "case_ids": [case_ids[0], case_ids[1], "missing", case_ids[0]], "action": "review",
+    }))
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["updated"], body["failed"]) == (1, 2)
+    assert body["results"] == [
+        {"case_id": case_ids[0], "success": True, "status": "under_review"},
+        {"case_id": case_ids[1], "success": False, "error": "Cannot review a case that is submitted"},
+        {"case_id": "missing", "success": False, "error": "Case not found"},
+    ]
+    assert run(app.db.workflow_events.count_documents({"action": "review"})) == 1
+
+
+def test_bulk_reports_cases_changed_between_read_and_write(app, api, login, run, monkeypatch):
+    headers = login()
+    case_ids = submit(api, run, 3)
+    assignee = active_user_id(api, run, headers)
+    collection = type(app.db.cases)
+    bulk_write = collection.bulk_write
+
+    async def racing_bulk_write(self, operations, ordered=True):
+        # Another request moves one case on after the chunk was read
+        await app.db.cases.update_one({"id": case_ids[1]}, {"$set": {"status": "approved"}})
+        return await bulk_write(self, operations, ordered=ordered)
+
+    monkeypatch.setattr(collection, "bulk_write", racing_bulk_write)
+    response = run(api.post("/api/cases/workflow/bulk", headers=headers, json={
+        "case_ids": case_ids, "action": "assign", "assigned_to": assignee,
+    }))
+    monkeypatch.undo()
+
+    results = response.json()["results"]
+    assert [result["success"] for result in results] == [True, False, True]
+    assert results[1]["error"] == "Case was changed by another request"
+    stats = run(api.get("/api/dashboard/stats", headers=headers)).json()["by_status"]
+    assert stats == {"submitted": 1, "assigned": 2}
+    detail = run(api.get(f"/api/cases/{case_ids[0]}", headers=headers)).json()
+    assert "workflow_op_id" not in detail
+
+
+def test_illegal_transition_is_a_conflict(app, api, login, run):
+    headers = login()
+    case_id = submit(api, run, 1)[0]
+    response = run(api.post(f"/api/cases/{case_id}/workflow", headers=headers, json={"action": "approve"}))
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Cannot approve a case that is submitted"
+    assert run(api.post("/api/cases/missing/workflow", headers=headers, json={"action": "review"})).status_code == 404
+
+
+def test_racing_transitions_on_the_expected_status_apply_once(app, api, login, run):
+    headers = login()
+    case_id = submit(api, run, 1)[0]
+    assignee = active_user_id(api, run, headers)
+    action = {"action": "assign", "assigned_to": assignee, "expected_status": "submitted"}
+
+    async def race():
+        return await asyncio.gather(*(api.post(f"/api/cases/{case_id}/workflow", headers=headers, json=action) for _ in range(5)))
+
+    statuses = sorted(response.status_code for response in run(race()))
+    assert statuses == [200, 409, 409, 409, 409]
+    assert run(app.db.cases.find_one({"id": case_id}))["history_count"] == 2